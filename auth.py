@@ -1,12 +1,13 @@
 """Authentication module for Google OAuth and user management."""
 import os
-import json
 from flask import session, redirect, url_for, request
 from flask_login import UserMixin, login_user, logout_user, login_required, current_user
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
 from config import Config
+from token_manager import credentials_to_dict
+from user_store import UserStore
 
 
 class User(UserMixin):
@@ -21,6 +22,8 @@ class User(UserMixin):
         self.getcourse_api_key = None
         self.getcourse_account = None
         self.drive_folder_id = None
+        # Bumped on every settings change so per-user caches can tell
+        self.settings_version = 0
     
     def to_dict(self):
         """Convert user to dictionary."""
@@ -31,7 +34,8 @@ class User(UserMixin):
             'picture': self.picture,
             'getcourse_api_key': self.getcourse_api_key,
             'getcourse_account': self.getcourse_account,
-            'drive_folder_id': self.drive_folder_id
+            'drive_folder_id': self.drive_folder_id,
+            'settings_version': self.settings_version
         }
     
     @staticmethod
@@ -46,6 +50,7 @@ class User(UserMixin):
         user.getcourse_api_key = data.get('getcourse_api_key')
         user.getcourse_account = data.get('getcourse_account')
         user.drive_folder_id = data.get('drive_folder_id')
+        user.settings_version = data.get('settings_version', 0)
         return user
 
 
@@ -62,29 +67,17 @@ class AuthManager:
     def __init__(self, app):
         self.app = app
         # Use /tmp for Vercel (read-only filesystem except /tmp)
+        self.users_db = os.getenv('USERS_DB', '/tmp/users.db' if os.getenv('VERCEL') else 'users.db')
+        self.users = UserStore(self.users_db, cache_size=Config.USER_CACHE_SIZE)
+        
+        # Users from the former JSON store are imported on first start
         self.users_file = os.getenv('USERS_FILE', '/tmp/users.json' if os.getenv('VERCEL') else 'users.json')
-        self.users = self._load_users()
-    
-    def _load_users(self):
-        """Load users from file."""
-        if os.path.exists(self.users_file):
-            try:
-                with open(self.users_file, 'r') as f:
-                    data = json.load(f)
-                    return {uid: User.from_dict(user_data) for uid, user_data in data.items()}
-            except:
-                return {}
-        return {}
-    
-    def _save_users(self):
-        """Save users to file."""
         try:
-            data = {uid: user.to_dict() for uid, user in self.users.items()}
-            with open(self.users_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            imported = self.users.migrate_json(self.users_file)
+            if imported:
+                print(f"Imported {imported} user(s) from {self.users_file}")
         except Exception as e:
-            # On Vercel, /tmp might not persist, log error but continue
-            print(f"Warning: Could not save users file: {e}")
+            print(f"Warning: Could not import users file: {e}")
     
     def get_flow(self):
         """Create OAuth flow."""
@@ -107,7 +100,8 @@ class AuthManager:
     
     def get_user(self, user_id):
         """Get user by ID."""
-        return self.users.get(user_id)
+        data = self.users.get(user_id)
+        return User.from_dict(data) if data else None
     
     def create_or_update_user(self, user_info, credentials):
         """Create or update user from Google OAuth response."""
@@ -116,38 +110,19 @@ class AuthManager:
         name = user_info.get('name', email)
         picture = user_info.get('picture')
         
-        if user_id in self.users:
-            user = self.users[user_id]
-            user.email = email
-            user.name = name
-            user.picture = picture
-        else:
-            user = User(user_id, email, name, picture)
-            self.users[user_id] = user
+        user = User.from_dict(self.users.upsert_profile(user_id, email, name, picture))
         
         # Store credentials in session (in production, use secure storage)
-        session['google_credentials'] = {
-            'token': credentials.token,
-            'refresh_token': credentials.refresh_token,
-            'token_uri': credentials.token_uri,
-            'client_id': credentials.client_id,
-            'client_secret': credentials.client_secret,
-            'scopes': credentials.scopes
-        }
+        session['google_credentials'] = credentials_to_dict(credentials)
         
-        self._save_users()
         return user
     
     def update_user_settings(self, user_id, getcourse_api_key=None, getcourse_account=None, drive_folder_id=None):
         """Update user settings."""
-        if user_id in self.users:
-            user = self.users[user_id]
-            if getcourse_api_key is not None:
-                user.getcourse_api_key = getcourse_api_key
-            if getcourse_account is not None:
-                user.getcourse_account = getcourse_account
-            if drive_folder_id is not None:
-                user.drive_folder_id = drive_folder_id
-            self._save_users()
-            return user
-        return None
\ No newline at end of file
+        data = self.users.update_settings(
+            user_id,
+            getcourse_api_key=getcourse_api_key,
+            getcourse_account=getcourse_account,
+            drive_folder_id=drive_folder_id
+        )
+        return User.from_dict(data) if data else None
\ No newline at end of file
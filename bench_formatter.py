@@ -0,0 +1,111 @@
+"""Benchmark the lesson text-to-HTML formatter against the previous implementation."""
+import argparse
+import time
+import tracemalloc
+from typing import Callable
+
+from html_formatter import format_text
+
+
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 ** 2, 10 * 1024 ** 2, 100 * 1024 ** 2]
+
+
+def legacy_format_content(content: str) -> str:
+    """``LessonProcessor._format_content`` before the streaming formatter."""
+    if not content or content.strip() == "":
+        return "<p>No content available.</p>"
+    
+    if '<html' in content.lower() or '<body' in content.lower():
+        return content
+    
+    paragraphs = content.split('\n\n')
+    formatted_paragraphs = []
+    for para in paragraphs:
+        para = para.strip()
+        if para:
+            para = para.replace('\n', '<br>\n')
+            formatted_paragraphs.append(f"<p>{para}</p>")
+    
+    html = f"""
+        <div class="lesson-content">
+            {''.join(formatted_paragraphs)}
+        </div>
+        <style>
+            .lesson-content {{
+                font-family: Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                padding: 20px;
+            }}
+            .lesson-content p {{
+                margin-bottom: 15px;
+            }}
+        </style>
+        """
+    return html.strip()
+
+
+def make_document(size: int) -> str:
+    """Build a lesson-like text of about ``size`` bytes."""
+    paragraph = (
+        "Урок: работа с потоками данных.\n"
+        "Каждая строка абзаца переносится отдельно, а абзацы разделены пустой строкой.\n"
+        "   Lines may carry leading and trailing spaces.   \n\n"
+    )
+    repeats = size // len(paragraph.encode('utf-8')) + 1
+    return (paragraph * repeats)[:size]
+
+
+def measure(func: Callable[[], object], repeat: int) -> tuple:
+    """Return (best seconds, peak traced bytes) of ``func``."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def human(size: float) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.0f} TB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the lesson text-to-HTML formatter")
+    parser.add_argument(
+        '--max-size',
+        type=int,
+        default=SIZES[-1],
+        help=f'Largest input in bytes (default: {SIZES[-1]})'
+    )
+    args = parser.parse_args()
+    
+    print(f"{'input':>8} | {'legacy':>18} | {'format_text':>18}")
+    for size in [s for s in SIZES if s <= args.max_size]:
+        text = make_document(size)
+        data = text.encode('utf-8')
+        assert format_text(text) == legacy_format_content(text)
+        repeat = 5 if size <= 1024 ** 2 else 1
+        
+        rows = [
+            measure(lambda: legacy_format_content(text), repeat),
+            measure(lambda: format_text(text), repeat),
+        ]
+        cells = [
+            f"{len(data) / seconds / 1024 ** 2:6.0f} MB/s {human(peak):>7}"
+            for seconds, peak in rows
+        ]
+        print(f"{human(len(data)):>8} | " + " | ".join(f"{cell:>18}" for cell in cells))
+    print("\nPeak is memory allocated during the call (input excluded), via tracemalloc.")
+
+
+if __name__ == "__main__":
+    main()
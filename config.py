@@ -6,22 +6,103 @@ from typing import Optional
 load_dotenv()
 
 
+def _writable_path(name: str) -> str:
+    """Default location of a local data file; only /tmp is writable on Vercel."""
+    return os.path.join('/tmp', name) if os.getenv('VERCEL') else name
+
+
 class Config:
     """Application configuration."""
     
-    # Google Drive settings
+    # Google Drive settings (GOOGLE_DRIVE_FOLDER_ID may list several
+    # comma-separated root folders)
     GOOGLE_DRIVE_FOLDER_ID: Optional[str] = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
     GOOGLE_CREDENTIALS_FILE: str = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
     GOOGLE_TOKEN_FILE: str = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
     
+    # Google Drive downloads: files larger than the threshold are streamed
+    # in chunks instead of being read into memory in one request
+    DRIVE_CHUNK_SIZE: int = int(os.getenv("DRIVE_CHUNK_SIZE", str(10 * 1024 * 1024)))
+    DRIVE_STREAM_THRESHOLD: int = int(os.getenv("DRIVE_STREAM_THRESHOLD", str(10 * 1024 * 1024)))
+    DRIVE_DOWNLOAD_RETRIES: int = int(os.getenv("DRIVE_DOWNLOAD_RETRIES", "5"))
+    
+    # Files per listing page (Drive allows up to 1000)
+    DRIVE_PAGE_SIZE: int = int(os.getenv("DRIVE_PAGE_SIZE", "1000"))
+    
+    # Folders listed concurrently during recursive traversal
+    DRIVE_LIST_WORKERS: int = int(os.getenv("DRIVE_LIST_WORKERS", "8"))
+    
+    # On-disk cache of downloaded/exported Drive content (empty disables it)
+    CONTENT_CACHE_DIR: str = os.getenv("CONTENT_CACHE_DIR", _writable_path("drive_cache"))
+    CONTENT_CACHE_MAX_BYTES: int = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+    
     # GetCourse API settings
     GETCOURSE_API_KEY: Optional[str] = os.getenv("GETCOURSE_API_KEY")
     GETCOURSE_API_URL: str = os.getenv("GETCOURSE_API_URL", "https://api.getcourse.ru")
     GETCOURSE_ACCOUNT: Optional[str] = os.getenv("GETCOURSE_ACCOUNT")
     
+    # GetCourse HTTP connection pool settings
+    GETCOURSE_POOL_SIZE: int = int(os.getenv("GETCOURSE_POOL_SIZE", "10"))
+    GETCOURSE_CONNECT_TIMEOUT: float = float(os.getenv("GETCOURSE_CONNECT_TIMEOUT", "5"))
+    GETCOURSE_READ_TIMEOUT: float = float(os.getenv("GETCOURSE_READ_TIMEOUT", "60"))
+    GETCOURSE_MAX_CONCURRENCY: int = int(os.getenv("GETCOURSE_MAX_CONCURRENCY", "10"))
+    GETCOURSE_WARM_UP: bool = os.getenv("GETCOURSE_WARM_UP", "false").lower() in ("1", "true", "yes")
+    
+    # GetCourse rate limiting and retries (rate 0 disables the token bucket)
+    GETCOURSE_RATE_LIMIT: float = float(os.getenv("GETCOURSE_RATE_LIMIT", "0"))
+    GETCOURSE_RATE_BURST: float = float(os.getenv("GETCOURSE_RATE_BURST", "0"))
+    GETCOURSE_MAX_RETRIES: int = int(os.getenv("GETCOURSE_MAX_RETRIES", "5"))
+    GETCOURSE_BACKOFF_BASE: float = float(os.getenv("GETCOURSE_BACKOFF_BASE", "0.5"))
+    GETCOURSE_BACKOFF_MAX: float = float(os.getenv("GETCOURSE_BACKOFF_MAX", "60"))
+    
+    # Read-through cache for lessons.list / lessons.get (TTL 0 disables it)
+    GETCOURSE_CACHE_TTL: float = float(os.getenv("GETCOURSE_CACHE_TTL", "60"))
+    GETCOURSE_CACHE_MAX_ENTRIES: int = int(os.getenv("GETCOURSE_CACHE_MAX_ENTRIES", "1000"))
+    GETCOURSE_CACHE_MAX_BYTES: int = int(os.getenv("GETCOURSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    
+    # Optional JSON file remembering which action names work per account
+    GETCOURSE_ACTION_CACHE_FILE: Optional[str] = os.getenv("GETCOURSE_ACTION_CACHE_FILE")
+    
+    # Worker threads for the bulk processing pipeline
+    FETCH_WORKERS: int = int(os.getenv("FETCH_WORKERS", "4"))
+    PUBLISH_WORKERS: int = int(os.getenv("PUBLISH_WORKERS", "4"))
+    
+    # Web app: users kept in memory per worker process (the rest stay in SQLite)
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "256"))
+    
+    # OAuth tokens are refreshed in the background this many seconds before
+    # expiry (keep above google-auth's ~4 minute threshold), for sessions
+    # active within TOKEN_IDLE_TTL seconds
+    TOKEN_REFRESH_MARGIN: float = float(os.getenv("TOKEN_REFRESH_MARGIN", "300"))
+    TOKEN_IDLE_TTL: float = float(os.getenv("TOKEN_IDLE_TTL", "1800"))
+    
+    # Web app: per-user client bundles kept between requests
+    USER_CLIENT_CACHE_SIZE: int = int(os.getenv("USER_CLIENT_CACHE_SIZE", "128"))
+    USER_CLIENT_CACHE_TTL: float = float(os.getenv("USER_CLIENT_CACHE_TTL", "1800"))
+    
+    # Web app: background jobs (e.g. /api/process-all) running at once
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    
+    # Web app: seconds between keep-alive comments on an idle job event stream
+    JOB_EVENTS_KEEPALIVE: float = float(os.getenv("JOB_EVENTS_KEEPALIVE", "15"))
+    
+    # Local SQLite file recording what has been published (empty disables it)
+    SYNC_STATE_DB: str = os.getenv("SYNC_STATE_DB", _writable_path("sync_state.db"))
+    
+    # Local SQLite catalog of Drive folder contents (empty disables it)
+    DRIVE_CATALOG_DB: str = os.getenv("DRIVE_CATALOG_DB", _writable_path("drive_catalog.db"))
+    
+    # Local SQLite history of bulk runs, used to resume them (empty disables it)
+    RUN_HISTORY_DB: str = os.getenv("RUN_HISTORY_DB", _writable_path("run_history.db"))
+    
     # Google Drive API scopes
     SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
     
+    @classmethod
+    def get_drive_folder_ids(cls) -> list:
+        """Get the configured root folder IDs."""
+        return [fid.strip() for fid in (cls.GOOGLE_DRIVE_FOLDER_ID or "").split(",") if fid.strip()]
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate that required configuration is present."""
@@ -0,0 +1,201 @@
+"""On-disk content-addressed cache for Google Drive downloads and exports."""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class ContentCache:
+    """
+    Disk cache of Drive file contents shared by concurrent workers.
+    
+    Entries are keyed by file ID, ``modifiedTime`` and variant (``media``
+    for the stored file or the export MIME type), so an edit in Drive
+    naturally misses the cache. Content is stored once per SHA-256 digest,
+    and Drive's ``md5Checksum`` lets a copy of an already cached file be
+    served without downloading it at all.
+    
+    Blobs are written to a temporary file and renamed into place, and the
+    index lives in SQLite, so several threads or processes can share one
+    cache directory. Total blob size is capped; least recently used entries
+    are evicted first.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            directory: Cache directory; created if missing.
+            max_bytes: Maximum total size of cached content.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._blob_dir = os.path.join(directory, 'blobs')
+        os.makedirs(self._blob_dir, exist_ok=True)
+        
+        self._conn = sqlite3.connect(
+            os.path.join(directory, 'index.db'),
+            timeout=30,
+            check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'md5_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    md5 TEXT,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_md5 ON entries (md5)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+    
+    @staticmethod
+    def make_key(file_id: str, modified_time: str, variant: str = 'media') -> str:
+        """Build the cache key for a file version."""
+        return f"{file_id}:{modified_time}:{variant}"
+    
+    def get(self, key: str, md5_checksum: Optional[str] = None) -> Optional[bytes]:
+        """
+        Look up cached content.
+        
+        Args:
+            key: Key from ``make_key``.
+            md5_checksum: Drive ``md5Checksum`` of the file, if known; used
+                to find identical content cached under another key.
+        
+        Returns:
+            Cached content, or None on a miss.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            stat = 'hits'
+            if row is None and md5_checksum:
+                row = self._conn.execute(
+                    "SELECT digest FROM entries WHERE md5 = ? LIMIT 1", (md5_checksum,)
+                ).fetchone()
+                stat = 'md5_hits'
+                if row is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, digest, md5, last_used) VALUES (?, ?, ?, ?)",
+                        (key, row[0], md5_checksum, time.time())
+                    )
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        
+        try:
+            with open(self._blob_path(row[0]), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            # Evicted by another process between the lookup and the read
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            self._stats[stat] += 1
+        return content
+    
+    def set(self, key: str, content: bytes, md5_checksum: Optional[str] = None) -> None:
+        """
+        Store content.
+        
+        Args:
+            key: Key from ``make_key``.
+            content: File content.
+            md5_checksum: Drive ``md5Checksum`` of the file, if known.
+        """
+        if len(content) > self.max_bytes:
+            return
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            fd, tmp_path = tempfile.mkstemp(dir=self._blob_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, size) VALUES (?, ?)", (digest, len(content))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, digest, md5, last_used) VALUES (?, ?, ?, ?)",
+                (key, digest, md5_checksum, time.time())
+            )
+            self._stats['stores'] += 1
+            self._evict()
+    
+    def fetch(self, key: str, loader: Callable[[], bytes], md5_checksum: Optional[str] = None) -> bytes:
+        """
+        Get content from the cache, loading and storing it on a miss.
+        
+        Args:
+            key: Key from ``make_key``.
+            loader: Function downloading the content.
+            md5_checksum: Drive ``md5Checksum`` of the file, if known.
+        
+        Returns:
+            File content.
+        """
+        content = self.get(key, md5_checksum)
+        if content is None:
+            content = loader()
+            self.set(key, content, md5_checksum)
+        return content
+    
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            stats['bytes'] = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        return stats
+    
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+    
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self._blob_dir, digest)
+    
+    def _evict(self) -> None:
+        """Drop least recently used entries until the size cap is met."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, digest FROM entries ORDER BY last_used LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            key, digest = row
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._stats['evictions'] += 1
+            
+            # Remove the blob once no entry refers to it
+            if self._conn.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone():
+                continue
+            size = self._conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()[0]
+            self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,178 @@
+"""Registry of lesson content enhancements with per-rule statistics."""
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+# A replacement is a ``re`` template (``\1``, ``\g<name>``) or a function
+Replacement = Union[str, Callable[[re.Match], str]]
+
+
+class ContentRule:
+    """One content enhancement: a pattern and what its matches become."""
+    
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        replacement: Replacement,
+        option: Optional[str] = None,
+        flags: int = 0
+    ):
+        """
+        Args:
+            name: Rule name used in statistics.
+            pattern: Regular expression, compiled once here.
+            replacement: ``re.sub`` template, or a function taking the match
+                and returning the replacement text.
+            option: ``enhance_content`` option that turns the rule off
+                when set to False; None means always on.
+            flags: ``re`` flags for the pattern.
+        """
+        self.name = name
+        self.replacement = replacement
+        self.option = option
+        self.regex = re.compile(pattern, flags)
+    
+    def apply(self, content: str) -> Tuple[str, int]:
+        """
+        Replace all matches of the rule.
+        
+        Returns:
+            (new content, number of matches).
+        """
+        return self.regex.subn(self.replacement, content)
+
+
+class RuleEngine:
+    """
+    Ordered registry of content rules with timing and match counters.
+    
+    Rules are applied in registration order, each to the output of the
+    previous one, with its precompiled pattern. Each rule runs as a
+    single ``subn`` call, so a rule with a literal prefix (``<img``,
+    ``http``) costs one fast prefix search on documents it does not
+    match, and templates are expanded in C.
+    
+    A single alternation of all rules would scan once but gets neither:
+    CPython's ``re`` has no multi-pattern search, so the alternation is
+    tried at every position and each match goes through a Python
+    callback, which is slower than a pass per rule for any realistic
+    number of rules.
+    
+    Counters record the documents processed and, per rule, matches and
+    the time spent, so the cost of each enhancement is visible.
+    """
+    
+    def __init__(self, rules: Iterable[ContentRule] = ()):
+        """
+        Args:
+            rules: Initial rules, in the order they are applied.
+        """
+        self._rules: List[ContentRule] = []
+        self._lock = threading.Lock()
+        self._stats = {'documents': 0, 'chars': 0, 'seconds': 0.0}
+        self._rule_stats: Dict[str, Dict] = {}
+        for rule in rules:
+            self.register(rule)
+    
+    @property
+    def rules(self) -> List[ContentRule]:
+        """Registered rules, in the order they are applied."""
+        return list(self._rules)
+    
+    def register(self, rule: ContentRule) -> ContentRule:
+        """
+        Add a rule after the existing ones.
+        
+        Returns:
+            The rule.
+        
+        Raises:
+            ValueError: A rule with the same name is already registered.
+        """
+        with self._lock:
+            if rule.name in self._rule_stats:
+                raise ValueError(f"Rule '{rule.name}' is already registered")
+            self._rules = self._rules + [rule]
+            self._rule_stats[rule.name] = {'matches': 0, 'seconds': 0.0}
+        return rule
+    
+    def apply(self, content: str, options: Optional[Dict] = None) -> str:
+        """
+        Apply the enabled rules to a document.
+        
+        Args:
+            content: Document text or HTML.
+            options: Rule options; a rule whose ``option`` is False here is
+                skipped.
+        
+        Returns:
+            The enhanced document.
+        """
+        if not content:
+            return content
+        options = options or {}
+        length = len(content)
+        results = []
+        started = time.perf_counter()
+        for rule in self._rules:
+            if rule.option is not None and not options.get(rule.option, True):
+                continue
+            rule_started = time.perf_counter()
+            content, count = rule.apply(content)
+            results.append((rule.name, count, time.perf_counter() - rule_started))
+        elapsed = time.perf_counter() - started
+        
+        with self._lock:
+            self._stats['documents'] += 1
+            self._stats['chars'] += length
+            self._stats['seconds'] += elapsed
+            for name, count, seconds in results:
+                self._rule_stats[name]['matches'] += count
+                self._rule_stats[name]['seconds'] += seconds
+        return content
+    
+    def stats(self, since: Optional[Dict] = None) -> Dict:
+        """
+        Return document counters and per-rule match counts and timings.
+        
+        Args:
+            since: An earlier ``stats()`` result; counters are then returned
+                relative to it, e.g. for a single run.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['rules'] = {name: dict(rule_stats) for name, rule_stats in self._rule_stats.items()}
+        if since:
+            for key in self._stats:
+                stats[key] -= since[key]
+            for name, rule_stats in stats['rules'].items():
+                for key, value in since['rules'].get(name, {}).items():
+                    rule_stats[key] -= value
+        return stats
+    
+    def reset_stats(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self._stats = {'documents': 0, 'chars': 0, 'seconds': 0.0}
+            for rule_stats in self._rule_stats.values():
+                rule_stats.update(matches=0, seconds=0.0)
+
+
+# Enhancements applied by LessonProcessor.enhance_content, in order
+CONTENT_RULES = RuleEngine([
+    ContentRule(
+        'youtube_embed',
+        r'(https?://(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]+))',
+        r'<iframe width="560" height="315" src="https://www.youtube.com/embed/\2" frameborder="0" allowfullscreen></iframe>',
+        option='embed_videos'
+    ),
+    ContentRule(
+        'image_style',
+        r'<img([^>]+)>',
+        r'<img\1 style="max-width: 100%; height: auto;">',
+        option='optimize_images'
+    ),
+])
@@ -0,0 +1,227 @@
+"""Local catalog of Google Drive folder contents kept current via the changes feed."""
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List
+
+
+# Files written per transaction while a folder is first listed
+WRITE_BATCH_SIZE = 500
+
+
+class DriveCatalog:
+    """
+    SQLite catalog of the files in watched Drive folders.
+    
+    The first ``sync`` of a folder lists it in full and remembers a position
+    in Drive's changes feed. Later syncs only read the changes since that
+    position, so their cost depends on how much changed, not on folder size.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_files (
+                    file_id TEXT NOT NULL,
+                    folder_id TEXT NOT NULL,
+                    name TEXT,
+                    metadata TEXT NOT NULL,
+                    PRIMARY KEY (folder_id, file_id)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS catalog_files_by_name ON catalog_files (folder_id, name, file_id)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS catalog_tokens (
+                    folder_id TEXT PRIMARY KEY,
+                    page_token TEXT NOT NULL
+                )
+            """)
+    
+    def get_page_token(self, folder_id: str):
+        """Get the saved changes-feed position for a folder, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_token FROM catalog_tokens WHERE folder_id = ?", (folder_id,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def list_files(self, folder_id: str) -> Iterator[Dict]:
+        """
+        Yield cataloged files of a folder, ordered by name.
+        
+        Rows are read from a separate connection as they are consumed, so
+        the folder is never loaded whole and other catalog calls are not
+        blocked while the caller works through the files.
+        
+        Args:
+            folder_id: Google Drive folder ID.
+        
+        Yields:
+            File metadata dictionaries.
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT metadata FROM catalog_files WHERE folder_id = ? ORDER BY name, file_id",
+                (folder_id,)
+            )
+            for (metadata,) in rows:
+                yield json.loads(metadata)
+        finally:
+            conn.close()
+    
+    def iter_replace_folder(self, folder_id: str, files: Iterable[Dict], page_token: str) -> Iterator[Dict]:
+        """
+        Replace a folder's catalog with a full listing, as it is read.
+        
+        Files are written in batches of ``WRITE_BATCH_SIZE`` and yielded
+        once stored, so a listing consumed page by page is never held in
+        memory. The changes-feed position is saved only when ``files`` is
+        exhausted; a listing that fails or is abandoned part way is
+        redone on the next sync.
+        
+        Args:
+            folder_id: Google Drive folder ID.
+            files: File metadata of the folder, e.g. ``iter_files_in_folder``.
+            page_token: Changes-feed position taken before the listing started.
+        
+        Yields:
+            File metadata dictionaries, in listing order.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM catalog_tokens WHERE folder_id = ?", (folder_id,))
+            self._conn.execute("DELETE FROM catalog_files WHERE folder_id = ?", (folder_id,))
+        
+        batch: List[Dict] = []
+        for file in files:
+            batch.append(file)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                self._insert_files(folder_id, batch)
+                yield from batch
+                batch = []
+        self._insert_files(folder_id, batch)
+        yield from batch
+        
+        with self._lock, self._conn:
+            self._save_token(folder_id, page_token)
+    
+    def apply_changes(self, folder_id: str, changes: List[Dict], page_token: str) -> List[Dict]:
+        """
+        Apply changes-feed entries to a folder's catalog.
+        
+        Args:
+            folder_id: Google Drive folder ID.
+            changes: Change dictionaries from ``GoogleDriveClient.get_changes``.
+            page_token: Changes-feed position to save for the next sync.
+        
+        Returns:
+            Metadata of files added to or modified in the folder.
+        """
+        changed = {}
+        with self._lock, self._conn:
+            for change in changes:
+                file = change.get('file') or {}
+                file_id = change.get('fileId') or file.get('id')
+                in_folder = (
+                    not change.get('removed')
+                    and not file.get('trashed')
+                    and folder_id in file.get('parents', [])
+                )
+                if not in_folder:
+                    self._conn.execute(
+                        "DELETE FROM catalog_files WHERE folder_id = ? AND file_id = ?",
+                        (folder_id, file_id)
+                    )
+                    changed.pop(file_id, None)
+                    continue
+                
+                metadata = {k: v for k, v in file.items() if k not in ('parents', 'trashed')}
+                self._conn.execute(
+                    """
+                    INSERT INTO catalog_files (file_id, folder_id, name, metadata) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (folder_id, file_id) DO UPDATE SET
+                        name = excluded.name,
+                        metadata = excluded.metadata
+                    """,
+                    (file_id, folder_id, metadata.get('name'), json.dumps(metadata))
+                )
+                changed[file_id] = metadata
+            self._save_token(folder_id, page_token)
+        return list(changed.values())
+    
+    def sync(self, drive_client, folder_id: str) -> List[Dict]:
+        """
+        Bring a folder's catalog up to date.
+        
+        Args:
+            drive_client: ``GoogleDriveClient`` instance.
+            folder_id: Google Drive folder ID.
+        
+        Returns:
+            Metadata of files added or modified since the previous sync
+            (every file on the first sync).
+        """
+        page_token = self.get_page_token(folder_id)
+        if page_token is None:
+            return list(self._list_into_catalog(drive_client, folder_id))
+        
+        changes, page_token = drive_client.get_changes(page_token)
+        return self.apply_changes(folder_id, changes, page_token)
+    
+    def iter_sync(self, drive_client, folder_id: str) -> Iterator[Dict]:
+        """
+        Bring a folder's catalog up to date and yield all of its files.
+        
+        On the first sync, files are yielded as listing pages arrive and
+        are stored; afterwards the changes are applied and the catalog is
+        read back with ``list_files``.
+        
+        Args:
+            drive_client: ``GoogleDriveClient`` instance.
+            folder_id: Google Drive folder ID.
+        
+        Yields:
+            File metadata dictionaries.
+        """
+        if self.get_page_token(folder_id) is None:
+            yield from self._list_into_catalog(drive_client, folder_id)
+        else:
+            self.sync(drive_client, folder_id)
+            yield from self.list_files(folder_id)
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _list_into_catalog(self, drive_client, folder_id: str) -> Iterator[Dict]:
+        """List a folder from Drive into the catalog, yielding its files."""
+        # Take the token first so nothing changed during the listing is lost
+        page_token = drive_client.get_start_page_token()
+        return self.iter_replace_folder(folder_id, drive_client.iter_files_in_folder(folder_id), page_token)
+    
+    def _insert_files(self, folder_id: str, files: List[Dict]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO catalog_files (file_id, folder_id, name, metadata) VALUES (?, ?, ?, ?)",
+                [(f['id'], folder_id, f.get('name'), json.dumps(f)) for f in files]
+            )
+    
+    def _save_token(self, folder_id: str, page_token: str) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO catalog_tokens (folder_id, page_token) VALUES (?, ?)
+            ON CONFLICT (folder_id) DO UPDATE SET page_token = excluded.page_token
+            """,
+            (folder_id, page_token)
+        )
@@ -0,0 +1,348 @@
+"""Local stand-in for the GetCourse actions API, for load and latency testing.
+
+Speaks the same form-encoded protocol as
+``https://{account}.getcourse.ru/pl/api/account/{account}/actions`` and can be
+started in-process or from the command line::
+
+    python fake_getcourse.py --port 8765 --latency normal:80:20 --throttle-rate 0.05
+
+Point a client at it with ``GetCourseAPI(account=..., api_url="http://127.0.0.1:8765")``.
+``python fake_getcourse.py --benchmark 500`` starts a server, publishes 500
+lessons through ``GetCourseAPI.create_lessons`` and prints the throughput.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+LESSON_CREATE_ACTIONS = ("streams.addLesson", "lessons.add", "lessons.create")
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Build a latency sampler from a spec string (all values in milliseconds).
+    
+    Supported specs: ``fixed:MS``, ``uniform:MIN:MAX``, ``normal:MEAN:STDDEV``
+    and ``exp:MEAN``. A bare number is treated as ``fixed``.
+    
+    Args:
+        spec: Latency specification.
+    
+    Returns:
+        Function returning a delay in seconds.
+    """
+    kind, _, rest = spec.partition(':')
+    if not rest:
+        kind, rest = 'fixed', spec
+    values = [float(v) / 1000 for v in rest.split(':')]
+    
+    if kind == 'fixed':
+        return lambda: values[0]
+    if kind == 'uniform':
+        return lambda: random.uniform(values[0], values[1])
+    if kind == 'normal':
+        return lambda: max(0.0, random.gauss(values[0], values[1]))
+    if kind == 'exp':
+        return lambda: random.expovariate(1 / values[0]) if values[0] else 0.0
+    raise ValueError(f"Unknown latency distribution: {kind}")
+
+
+class FakeGetCourseServer:
+    """
+    In-memory GetCourse actions server.
+    
+    Supports ``streams.addLesson``, ``lessons.add``, ``lessons.create``,
+    ``lessons.update``, ``lessons.list``, ``lessons.get`` and
+    ``courses.create``. Latency, 5xx error rate and 429 injection are
+    configurable; per-action counters are available from ``stats()`` or
+    ``GET /__stats__``.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_key: Optional[str] = None,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        create_actions: Iterable[str] = LESSON_CREATE_ACTIONS
+    ):
+        """
+        Args:
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free one.
+            api_key: Expected ``key`` parameter. Any key is accepted if None.
+            latency: Latency spec, see ``parse_latency``.
+            error_rate: Fraction of requests answered with HTTP 500.
+            throttle_rate: Fraction of requests answered with HTTP 429.
+            retry_after: ``Retry-After`` seconds sent with 429 responses.
+            create_actions: Lesson-create action names this "account" accepts;
+                the others answer "Unknown action", like real accounts do.
+        """
+        self.api_key = api_key
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.create_actions = set(create_actions)
+        
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.lessons: Dict[str, Dict] = {}
+        self.courses: Dict[str, Dict] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def url(self) -> str:
+        """Base URL to pass as ``GetCourseAPI(api_url=...)``."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self) -> "FakeGetCourseServer":
+        """Serve requests from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-action counters: requests, ok, errors, throttled, unknown."""
+        with self._lock:
+            return {action: dict(counts) for action, counts in self._counters.items()}
+    
+    def reset_stats(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self._counters = {}
+    
+    def _count(self, action: str, outcome: str) -> None:
+        with self._lock:
+            counts = self._counters.setdefault(
+                action, {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'unknown': 0}
+            )
+            counts['requests'] += 1
+            counts[outcome] += 1
+    
+    def handle_action(self, params: Dict[str, str]):
+        """
+        Process one action request.
+        
+        Args:
+            params: Decoded form parameters.
+        
+        Returns:
+            Tuple of (HTTP status, response body dict, extra headers).
+        """
+        action = params.get('action', '')
+        time.sleep(self.sample_latency())
+        
+        roll = random.random()
+        if roll < self.throttle_rate:
+            self._count(action, 'throttled')
+            return 429, {'success': False, 'error_message': 'Too many requests'}, {
+                'Retry-After': str(self.retry_after)
+            }
+        if roll < self.throttle_rate + self.error_rate:
+            self._count(action, 'errors')
+            return 500, {'success': False, 'error_message': 'Internal server error'}, {}
+        
+        if self.api_key is not None and params.get('key') != self.api_key:
+            self._count(action, 'errors')
+            return 200, {'success': False, 'error_message': 'Invalid key'}, {}
+        
+        handler = {
+            'lessons.update': self._update_lesson,
+            'lessons.list': self._list_lessons,
+            'lessons.get': self._get_lesson,
+            'courses.create': self._create_course,
+        }.get(action)
+        if handler is None and action in self.create_actions:
+            handler = self._create_lesson
+        if handler is None:
+            self._count(action, 'unknown')
+            return 200, {'success': False, 'error_message': f'Unknown action: {action}'}, {}
+        
+        body = handler(params)
+        self._count(action, 'ok' if body.get('success') else 'errors')
+        return 200, body, {}
+    
+    def _create_lesson(self, params: Dict[str, str]) -> Dict:
+        lesson_id = str(next(self._ids))
+        lesson = {k: v for k, v in params.items() if k not in ('key', 'action')}
+        lesson['id'] = lesson_id
+        with self._lock:
+            self.lessons[lesson_id] = lesson
+        return {'success': True, 'lesson_id': lesson_id}
+    
+    def _update_lesson(self, params: Dict[str, str]) -> Dict:
+        lesson_id = params.get('lesson_id')
+        with self._lock:
+            lesson = self.lessons.get(lesson_id)
+            if lesson is None:
+                return {'success': False, 'error_message': 'Lesson not found'}
+            lesson.update({k: v for k, v in params.items() if k not in ('key', 'action', 'lesson_id')})
+        return {'success': True, 'lesson_id': lesson_id}
+    
+    def _list_lessons(self, params: Dict[str, str]) -> Dict:
+        with self._lock:
+            lessons = [
+                dict(lesson) for lesson in self.lessons.values()
+                if all(lesson.get(f) == params[f] for f in ('course_id', 'stream_id') if f in params)
+            ]
+        return {'success': True, 'lessons': lessons}
+    
+    def _get_lesson(self, params: Dict[str, str]) -> Dict:
+        with self._lock:
+            lesson = self.lessons.get(params.get('lesson_id'))
+        if lesson is None:
+            return {'success': False, 'error_message': 'Lesson not found'}
+        return {'success': True, 'lesson': dict(lesson)}
+    
+    def _create_course(self, params: Dict[str, str]) -> Dict:
+        course_id = str(next(self._ids))
+        course = {k: v for k, v in params.items() if k not in ('key', 'action')}
+        course['id'] = course_id
+        with self._lock:
+            self.courses[course_id] = course
+        return {'success': True, 'course_id': course_id}
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 so clients can keep connections alive
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/__stats__':
+                    self._reply(200, server.stats(), {})
+                    return
+                self._dispatch(url.path, url.query)
+            
+            def do_POST(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                self._dispatch(url.path, self.rfile.read(length).decode('utf-8'))
+            
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            
+            def _dispatch(self, path: str, query: str):
+                if not (path.startswith('/pl/api/account/') and path.endswith('/actions')):
+                    self._reply(404, {'success': False, 'error_message': 'Not found'}, {})
+                    return
+                params = {k: v[-1] for k, v in parse_qs(query, keep_blank_values=True).items()}
+                self._reply(*server.handle_action(params))
+            
+            def _reply(self, status: int, body: Dict, headers: Dict[str, str]):
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+
+
+def run_benchmark(server: FakeGetCourseServer, count: int, window: Optional[int] = None) -> None:
+    """Publish ``count`` lessons to ``server`` and print throughput."""
+    from getcourse_api import GetCourseAPI
+    
+    api = GetCourseAPI(api_key='benchmark', account='benchmark', api_url=server.url)
+    lessons = (
+        {'title': f'Lesson {i}', 'description': 'Benchmark lesson', 'content': '<p>Text</p>', 'order': i}
+        for i in range(count)
+    )
+    
+    started = time.perf_counter()
+    results = api.create_lessons(lessons, window=window)
+    elapsed = time.perf_counter() - started
+    api.close()
+    
+    created = sum(1 for r in results if r['success'])
+    stats = api.get_rate_limit_stats()
+    print(f"📊 Published {created}/{count} lesson(s) in {elapsed:.2f}s ({count / elapsed:.1f} lessons/s)")
+    print(f"   Retries: {stats['retries']}, waited {stats['backoff_wait_seconds']:.1f}s on backoff")
+    print(f"   Server counters: {json.dumps(server.stats(), indent=2)}")
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Local GetCourse stand-in server")
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (0 picks a free one)')
+    parser.add_argument('--api-key', help='Only accept this API key')
+    parser.add_argument('--latency', default='fixed:0',
+                        help='Latency in ms: fixed:MS, uniform:MIN:MAX, normal:MEAN:STDDEV or exp:MEAN')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of HTTP 500 responses')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of HTTP 429 responses')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds for 429 responses')
+    parser.add_argument('--create-actions', default=','.join(LESSON_CREATE_ACTIONS),
+                        help='Comma-separated lesson-create action names the fake account accepts')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Publish N lessons against an in-process server and exit')
+    parser.add_argument('--window', type=int, help='In-flight window for --benchmark')
+    args = parser.parse_args()
+    
+    server = FakeGetCourseServer(
+        host=args.host,
+        port=0 if args.benchmark else args.port,
+        api_key=args.api_key,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        create_actions=[a for a in args.create_actions.split(',') if a]
+    )
+    
+    if args.benchmark:
+        with server:
+            run_benchmark(server, args.benchmark, args.window)
+        return
+    
+    print(f"🧪 Fake GetCourse listening on {server.url}")
+    print(f"   Use GetCourseAPI(api_url='{server.url}', account=...)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
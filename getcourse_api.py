@@ -1,13 +1,129 @@
 """GetCourse API client for creating lessons."""
+import json
+import os
+import threading
+import time
+import weakref
 import requests
-from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterable, Optional, List
+from cache import TTLCache
 from config import Config
+from rate_limiter import TokenBucket, RetryPolicy, WaitStats
 
 
-class GetCourseAPI:
-    """Client for interacting with GetCourse API."""
+# Fragments of GetCourse error messages meaning the action name itself is not supported
+UNKNOWN_ACTION_MARKERS = (
+    "unknown action",
+    "action not found",
+    "method not found",
+    "неизвестное действие",
+    "неизвестный метод",
+    "метод не найден",
+)
+
+
+class GetCourseUnknownActionError(Exception):
+    """Raised when GetCourse does not recognise the requested action name."""
+    
+    def __init__(self, action: str, message: str = ""):
+        super().__init__(f"Unknown GetCourse action '{action}': {message}".strip())
+        self.action = action
+
+
+def _is_unknown_action(ok: bool, text: str) -> bool:
+    """
+    Check whether a GetCourse response rejects the action name.
+    
+    Args:
+        ok: Whether the HTTP status was successful.
+        text: Response body.
+    
+    Returns:
+        True if the response reports an unknown action.
+    """
+    if ok:
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return False
+        if not isinstance(data, dict) or data.get("success", True):
+            return False
+    text = text.lower()
+    return any(marker in text for marker in UNKNOWN_ACTION_MARKERS)
+
+
+def _parse_response(text: str) -> Dict:
+    """Parse a GetCourse response body, falling back to raw text."""
+    # GetCourse API may return different formats
+    try:
+        return json.loads(text)
+    except ValueError:
+        # If not JSON, return text response
+        return {"success": True, "response": text}
+
+
+class GetCourseClientBase:
+    """
+    Transport-independent part of the GetCourse clients.
+    
+    Holds credentials, endpoint URLs, timeouts, payload building, the
+    per-account cache of working action names and the per-account rate
+    limiter. ``GetCourseAPI`` and ``AsyncGetCourseAPI`` add the actual HTTP
+    transport on top.
+    
+    Requests are paced by a token bucket shared by all clients of the same
+    account. Throttled (429) and transient 5xx responses, as well as
+    connection errors, are retried with exponential backoff and jitter,
+    honouring ``Retry-After``; create actions are not retried after a 5xx,
+    since the object may already exist. Time spent waiting is reported by
+    ``get_rate_limit_stats()``.
+    
+    Read actions (``lessons.list``, ``lessons.get``) go through a
+    process-wide TTL+LRU cache keyed by account, action and parameters.
+    Write actions drop the cached entries they can affect.
+    """
+    
+    # Candidate action names for creating a lesson, in probing order
+    LESSON_CREATE_ACTIONS = ("streams.addLesson", "lessons.add", "lessons.create")
     
-    def __init__(self, api_key=None, account=None, api_url=None):
+    # Actions that create a new object on every call. After a 5xx the object
+    # may exist already, so these are only retried when throttled (429).
+    CREATE_ACTIONS = LESSON_CREATE_ACTIONS + ("courses.create",)
+    
+    # {account: {operation: action}} shared by all instances
+    _resolved_actions: Dict[str, Dict[str, str]] = {}
+    _resolved_actions_lock = threading.Lock()
+    
+    # Read actions served through the response cache
+    CACHED_ACTIONS = ("lessons.list", "lessons.get")
+    
+    # {(account, action, params): response text} shared by all instances
+    _response_cache = TTLCache(
+        max_entries=Config.GETCOURSE_CACHE_MAX_ENTRIES,
+        max_bytes=Config.GETCOURSE_CACHE_MAX_BYTES,
+        ttl=Config.GETCOURSE_CACHE_TTL
+    )
+    
+    # {account: TokenBucket} shared by all instances
+    _buckets: Dict[str, TokenBucket] = {}
+    _buckets_lock = threading.Lock()
+    
+    def __init__(
+        self,
+        api_key=None,
+        account=None,
+        api_url=None,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        action_cache_file: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        use_cache: bool = True
+    ):
         self.api_key = api_key or Config.GETCOURSE_API_KEY
         self.api_url = api_url or Config.GETCOURSE_API_URL
         self.account = account or Config.GETCOURSE_ACCOUNT
@@ -17,6 +133,374 @@ class GetCourseAPI:
         
         if not self.account:
             raise ValueError("GetCourse account name is required (extract from URL, e.g., 'riprokurs' from riprokurs.getcourse.ru)")
+        
+        # GetCourse API format: https://account.getcourse.ru/pl/api/account/account_name/actions
+        # An explicit api_url (e.g. a local fake_getcourse server) overrides the account host
+        if api_url:
+            self.base_url = api_url.rstrip('/')
+        else:
+            self.base_url = f"https://{self.account}.getcourse.ru"
+        self.actions_url = f"{self.base_url}/pl/api/account/{self.account}/actions"
+        
+        self.pool_size = pool_size or Config.GETCOURSE_POOL_SIZE
+        self.connect_timeout = connect_timeout if connect_timeout is not None else Config.GETCOURSE_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout if read_timeout is not None else Config.GETCOURSE_READ_TIMEOUT
+        
+        self.action_cache_file = action_cache_file or Config.GETCOURSE_ACTION_CACHE_FILE
+        self._load_action_cache()
+        
+        self.bucket = self._get_bucket(
+            self.account,
+            rate_limit if rate_limit is not None else Config.GETCOURSE_RATE_LIMIT,
+            rate_burst or Config.GETCOURSE_RATE_BURST or None
+        )
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries if max_retries is not None else Config.GETCOURSE_MAX_RETRIES,
+            backoff_base=Config.GETCOURSE_BACKOFF_BASE,
+            backoff_max=Config.GETCOURSE_BACKOFF_MAX
+        )
+        self.wait_stats = WaitStats()
+        
+        self.use_cache = use_cache and Config.GETCOURSE_CACHE_TTL > 0
+    
+    @classmethod
+    def _get_bucket(cls, account: str, rate: float, capacity: Optional[float]) -> TokenBucket:
+        """Return the account's token bucket, creating it on first use."""
+        with cls._buckets_lock:
+            bucket = cls._buckets.get(account)
+            if bucket is None or bucket.rate != rate:
+                bucket = TokenBucket(rate, capacity)
+                cls._buckets[account] = bucket
+            return bucket
+    
+    def get_rate_limit_stats(self) -> Dict:
+        """
+        Get rate limiting and retry counters for this client.
+        
+        Returns:
+            Dictionary with request/retry counts and seconds spent waiting.
+        """
+        return self.wait_stats.snapshot()
+    
+    def _reserve_slot(self) -> float:
+        """Take a token from the account bucket and return the wait in seconds."""
+        delay = self.bucket.reserve()
+        self.wait_stats.add('requests')
+        if delay:
+            self.wait_stats.add('rate_limit_wait_seconds', delay)
+        return delay
+    
+    def _retry_statuses(self, action: str) -> tuple:
+        """Get the HTTP statuses after which ``action`` is sent again."""
+        if action in self.CREATE_ACTIONS:
+            return (429,)
+        return RetryPolicy.RETRY_STATUSES
+    
+    def _retry_delay(
+        self,
+        attempt: int,
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Decide whether a failed attempt should be retried.
+        
+        Args:
+            attempt: Number of retries already made.
+            status: HTTP status, or None for a connection error.
+            retry_after: Value of the ``Retry-After`` header, if any.
+        
+        Returns:
+            Seconds to wait before retrying, or None to give up.
+        """
+        if status is None:
+            self.wait_stats.add('connection_errors')
+        elif status == 429:
+            self.wait_stats.add('throttled_responses')
+        elif status >= 500:
+            self.wait_stats.add('server_errors')
+        
+        if not self.retry_policy.should_retry(attempt, status):
+            return None
+        
+        delay = self.retry_policy.delay(attempt, retry_after)
+        if status == 429:
+            # Hold back every client of this account, not only this request
+            self.bucket.defer(delay)
+        self.wait_stats.add('retries')
+        self.wait_stats.add('backoff_wait_seconds', delay)
+        return delay
+    
+    def get_cache_stats(self) -> Dict:
+        """
+        Get response cache counters.
+        
+        The cache is shared by all clients in the process, so the numbers
+        cover every account.
+        
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes.
+        """
+        return self._response_cache.stats()
+    
+    def _cache_key(self, payload: Dict) -> tuple:
+        """Build the response cache key for a payload."""
+        params = tuple(sorted(
+            (k, str(v)) for k, v in payload.items() if k not in ("key", "action")
+        ))
+        return (self.account, payload["action"], params)
+    
+    def _cached_response(self, payload: Dict) -> Optional[Dict]:
+        """Return a cached response for a read action, or None."""
+        if not self.use_cache or payload["action"] not in self.CACHED_ACTIONS:
+            return None
+        text = self._response_cache.get(self._cache_key(payload))
+        return None if text is None else _parse_response(text)
+    
+    def _update_cache(self, payload: Dict, text: str, result: Dict) -> None:
+        """Store a read response, or drop entries a write may have changed."""
+        action = payload["action"]
+        if action in self.CACHED_ACTIONS:
+            if self.use_cache and result.get("success", True) is not False:
+                self._response_cache.set(self._cache_key(payload), text, len(text.encode("utf-8")))
+            return
+        
+        lesson_id = str(payload["lesson_id"]) if action == "lessons.update" else None
+        
+        def affected(key):
+            account, cached_action, params = key
+            if account != self.account:
+                return False
+            if cached_action == "lessons.list":
+                return True
+            return lesson_id is not None and ("lesson_id", lesson_id) in params
+        
+        self._response_cache.invalidate(affected)
+    
+    def _load_action_cache(self) -> None:
+        """Merge action names stored on disk into the in-memory cache."""
+        if not self.action_cache_file or not os.path.exists(self.action_cache_file):
+            return
+        try:
+            with open(self.action_cache_file, 'r') as f:
+                stored = json.load(f).get(self.account, {})
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Warning: Could not read GetCourse action cache: {e}")
+            return
+        with self._resolved_actions_lock:
+            known = self._resolved_actions.setdefault(self.account, {})
+            for operation, action in stored.items():
+                known.setdefault(operation, action)
+    
+    def _save_action_cache(self) -> None:
+        """Persist this account's resolved action names to disk."""
+        if not self.action_cache_file:
+            return
+        try:
+            data = {}
+            if os.path.exists(self.action_cache_file):
+                with open(self.action_cache_file, 'r') as f:
+                    data = json.load(f)
+            with self._resolved_actions_lock:
+                data[self.account] = dict(self._resolved_actions.get(self.account, {}))
+            tmp_file = f"{self.action_cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.action_cache_file)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not save GetCourse action cache: {e}")
+    
+    def _remember_action(self, operation: str, action: Optional[str]) -> None:
+        """Record (or, with ``action=None``, forget) the working action for an operation."""
+        with self._resolved_actions_lock:
+            known = self._resolved_actions.setdefault(self.account, {})
+            if known.get(operation) == action:
+                return
+            if action is None:
+                known.pop(operation, None)
+            else:
+                known[operation] = action
+        self._save_action_cache()
+    
+    def _known_action(self, operation: str) -> Optional[str]:
+        """Return the remembered action name for an operation, if any."""
+        with self._resolved_actions_lock:
+            return self._resolved_actions.get(self.account, {}).get(operation)
+    
+    def _candidate_actions(self, operation: str, actions: tuple) -> List[str]:
+        """Order candidate action names with the remembered one first."""
+        known = self._known_action(operation)
+        if not known:
+            return list(actions)
+        return [known] + [a for a in actions if a != known]
+    
+    def _build_payload(self, params: Optional[Dict] = None) -> Dict:
+        """Build the form payload shared by every action attempt."""
+        # GetCourse API uses form data, not JSON
+        payload = {"key": self.api_key}
+        if params:
+            payload.update(params)
+        return payload
+    
+    @staticmethod
+    def _lesson_params(
+        title: str,
+        description: str,
+        content: str,
+        course_id: Optional[str] = None,
+        stream_id: Optional[str] = None,
+        order: Optional[int] = None,
+        **kwargs
+    ) -> Dict:
+        """Build request parameters for creating a lesson."""
+        # GetCourse API uses different parameter names
+        params = {
+            "title": title,
+            "description": description,
+            "text": content,  # GetCourse may use 'text' instead of 'content'
+        }
+        
+        if stream_id:
+            params["stream_id"] = stream_id
+        elif course_id:
+            params["course_id"] = course_id
+        
+        if order is not None:
+            params["order"] = order
+        
+        params.update(kwargs)
+        return params
+    
+    @staticmethod
+    def _update_params(
+        lesson_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        content: Optional[str] = None,
+        **kwargs
+    ) -> Dict:
+        """Build request parameters for updating a lesson."""
+        params = {"lesson_id": lesson_id}
+        
+        if title:
+            params["title"] = title
+        if description:
+            params["description"] = description
+        if content:
+            params["content"] = content
+        
+        params.update(kwargs)
+        return params
+    
+    @staticmethod
+    def _course_params(title: str, description: str, **kwargs) -> Dict:
+        """Build request parameters for creating a course."""
+        params = {
+            "title": title,
+            "description": description,
+        }
+        params.update(kwargs)
+        return params
+
+
+class GetCourseAPI(GetCourseClientBase):
+    """
+    Client for interacting with GetCourse API.
+    
+    The client owns a keep-alive connection pool, so consecutive actions reuse
+    the same TCP+TLS connection to the account host. A single instance can be
+    shared across threads: every thread gets its own ``requests.Session`` but
+    all sessions are mounted on one shared, thread-safe pool.
+    
+    Action names differ between GetCourse accounts. The working name for an
+    operation is probed once per account and remembered for the lifetime of
+    the process (and, optionally, in a JSON file across runs).
+    """
+    
+    def __init__(
+        self,
+        api_key=None,
+        account=None,
+        api_url=None,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        warm_up: Optional[bool] = None,
+        action_cache_file: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        use_cache: bool = True
+    ):
+        super().__init__(
+            api_key=api_key,
+            account=account,
+            api_url=api_url,
+            pool_size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            action_cache_file=action_cache_file,
+            rate_limit=rate_limit,
+            rate_burst=rate_burst,
+            max_retries=max_retries,
+            use_cache=use_cache
+        )
+        self.timeout = (self.connect_timeout, self.read_timeout)
+        
+        # One adapter (and therefore one urllib3 pool) shared by all threads;
+        # pool_block makes extra threads wait for a free connection instead of
+        # opening throwaway ones.
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=True
+        )
+        # Sessions are owned by their thread's local storage; the set only
+        # tracks the live ones for close() and drops those of finished threads
+        self._local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._sessions_lock = threading.Lock()
+        # Held while an operation's action name is being probed, so concurrent
+        # first calls wait for one probe instead of each doing their own
+        self._probe_lock = threading.Lock()
+        
+        if warm_up if warm_up is not None else Config.GETCOURSE_WARM_UP:
+            self.warm_up()
+    
+    @property
+    def session(self) -> requests.Session:
+        """Per-thread session mounted on the shared connection pool."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.add(session)
+        return session
+    
+    def warm_up(self) -> None:
+        """Open a connection to the account host ahead of the first action."""
+        try:
+            self.session.head(self.base_url, timeout=self.timeout, allow_redirects=False)
+        except requests.exceptions.RequestException as e:
+            print(f"GetCourse warm-up failed: {e}")
+    
+    def close(self) -> None:
+        """Close all sessions and release pooled connections."""
+        with self._sessions_lock:
+            for session in list(self._sessions):
+                session.close()
+            self._sessions = weakref.WeakSet()
+        self._local = threading.local()
+        self._adapter.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _make_request(
         self,
@@ -35,38 +519,114 @@ class GetCourseAPI:
         Returns:
             API response as dictionary.
         """
-        # GetCourse API format: https://account.getcourse.ru/pl/api/account/account_name/actions
-        if self.account:
-            base_url = f"https://{self.account}.getcourse.ru"
-        else:
-            base_url = self.api_url
+        payload = self._build_payload(params)
+        payload["action"] = action
+        return self._send(payload, method)
+    
+    def _make_request_with_fallback(
+        self,
+        operation: str,
+        actions: tuple,
+        params: Optional[Dict] = None,
+        method: str = "POST"
+    ) -> Dict:
+        """
+        Make a request using the first action name the account supports.
         
-        url = f"{base_url}/pl/api/account/{self.account}/actions"
+        The resolved name is tried first; other candidates are tried only when
+        GetCourse reports the action as unknown. Timeouts and other errors are
+        raised immediately, so a slow response never causes a duplicate create.
         
-        # GetCourse API uses form data, not JSON
-        payload = {
-            "key": self.api_key,
-            "action": action,
-        }
+        Args:
+            operation: Logical operation name used as the cache key.
+            actions: Candidate action names in probing order.
+            params: Request parameters.
+            method: HTTP method (POST or GET).
         
-        if params:
-            payload.update(params)
+        Returns:
+            API response as dictionary.
+        """
+        if self._known_action(operation) is None:
+            with self._probe_lock:
+                return self._try_actions(operation, actions, params, method)
+        return self._try_actions(operation, actions, params, method)
+    
+    def _try_actions(
+        self,
+        operation: str,
+        actions: tuple,
+        params: Optional[Dict] = None,
+        method: str = "POST"
+    ) -> Dict:
+        """Try candidate action names in order until one is accepted."""
+        candidates = self._candidate_actions(operation, actions)
+        payload = self._build_payload(params)
+        last_error = None
+        for action in candidates:
+            payload["action"] = action
+            try:
+                result = self._send(payload, method)
+            except GetCourseUnknownActionError as e:
+                last_error = e
+                if action == candidates[0]:
+                    self._remember_action(operation, None)
+                continue
+            self._remember_action(operation, action)
+            return result
+        
+        raise last_error
+    
+    def _send(self, payload: Dict, method: str = "POST") -> Dict:
+        """
+        Send a prepared payload to the actions endpoint.
+        
+        Args:
+            payload: Form payload including ``key`` and ``action``.
+            method: HTTP method (POST or GET).
+        
+        Returns:
+            API response as dictionary.
+        """
+        url = self.actions_url
+        retry_statuses = self._retry_statuses(payload["action"])
+        
+        cached = self._cached_response(payload)
+        if cached is not None:
+            return cached
         
         try:
-            if method.upper() == "POST":
-                # GetCourse API typically expects form data
-                response = requests.post(url, data=payload)
-            else:
-                response = requests.get(url, params=payload)
+            attempt = 0
+            while True:
+                time.sleep(self._reserve_slot())
+                try:
+                    if method.upper() == "POST":
+                        # GetCourse API typically expects form data
+                        response = self.session.post(url, data=payload, timeout=self.timeout)
+                    else:
+                        response = self.session.get(url, params=payload, timeout=self.timeout)
+                except requests.exceptions.ConnectionError:
+                    # Refused/reset connections are retried; read timeouts are
+                    # not, since the action may already have run
+                    delay = self._retry_delay(attempt)
+                    if delay is None:
+                        raise
+                else:
+                    delay = self._retry_delay(
+                        attempt, response.status_code, response.headers.get('Retry-After')
+                    ) if response.status_code in retry_statuses else None
+                    if delay is None:
+                        break
+                attempt += 1
+                time.sleep(delay)
+            
+            if _is_unknown_action(response.ok, response.text):
+                raise GetCourseUnknownActionError(payload["action"], response.text[:200])
             
             response.raise_for_status()
             
-            # GetCourse API may return different formats
-            try:
-                return response.json()
-            except ValueError:
-                # If not JSON, return text response
-                return {"success": True, "response": response.text}
+            result = _parse_response(response.text)
+            self._update_cache(payload, response.text, result)
+            return result
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
             if hasattr(e, 'response') and e.response is not None:
@@ -99,31 +659,17 @@ class GetCourseAPI:
         Returns:
             Created lesson data.
         """
-        # GetCourse API uses different parameter names
-        params = {
-            "title": title,
-            "description": description,
-            "text": content,  # GetCourse may use 'text' instead of 'content'
-        }
-        
-        if stream_id:
-            params["stream_id"] = stream_id
-        elif course_id:
-            params["course_id"] = course_id
+        params = self._lesson_params(
+            title, description, content,
+            course_id=course_id, stream_id=stream_id, order=order, **kwargs
+        )
         
-        if order is not None:
-            params["order"] = order
-        
-        params.update(kwargs)
-        
-        # Try different action names that GetCourse might use
-        try:
-            return self._make_request("streams.addLesson", params)
-        except:
-            try:
-                return self._make_request("lessons.add", params)
-            except:
-                return self._make_request("lessons.create", params)
+        # Different accounts accept different action names
+        return self._make_request_with_fallback(
+            "create_lesson",
+            self.LESSON_CREATE_ACTIONS,
+            params
+        )
     
     def update_lesson(
         self,
@@ -146,16 +692,9 @@ class GetCourseAPI:
         Returns:
             Updated lesson data.
         """
-        params = {"lesson_id": lesson_id}
-        
-        if title:
-            params["title"] = title
-        if description:
-            params["description"] = description
-        if content:
-            params["content"] = content
-        
-        params.update(kwargs)
+        params = self._update_params(
+            lesson_id, title=title, description=description, content=content, **kwargs
+        )
         
         return self._make_request("lessons.update", params)
     
@@ -188,6 +727,116 @@ class GetCourseAPI:
         """
         return self._make_request("lessons.get", {"lesson_id": lesson_id})
     
+    def _run_batch(
+        self,
+        call: Callable[..., Dict],
+        items: Iterable[Dict],
+        window: Optional[int] = None,
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Run ``call(**item)`` for every item with a bounded number in flight.
+        
+        Items are pulled from ``items`` lazily, so a generator that prepares
+        lessons keeps working while earlier ones are being sent.
+        
+        Args:
+            call: Client method to invoke for each item.
+            items: Iterable of keyword-argument dictionaries.
+            window: Maximum requests in flight. Defaults to the pool size.
+            on_result: Called as ``on_result(index, outcome)`` as soon as each
+                item finishes, e.g. to report progress.
+        
+        Returns:
+            One result per item, in input order: ``{'success', 'result', 'error'}``.
+        """
+        window = window or self.pool_size
+        results: List[Optional[Dict]] = []
+        pending = {}
+        
+        def collect(done):
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = {'success': True, 'result': future.result(), 'error': None}
+                except Exception as e:
+                    results[index] = {'success': False, 'result': None, 'error': str(e)}
+                if on_result:
+                    on_result(index, results[index])
+        
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            for item in items:
+                if len(pending) >= window:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                results.append(None)
+                pending[executor.submit(call, **item)] = len(results) - 1
+            
+            done, _ = wait(pending)
+            collect(done)
+        
+        return results
+    
+    def create_lessons(
+        self,
+        lessons: Iterable[Dict],
+        window: Optional[int] = None,
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Create many lessons, pipelined over the pooled connection.
+        
+        Failures are collected per item instead of stopping the batch.
+        
+        Args:
+            lessons: Iterable of dictionaries with ``create_lesson`` arguments
+                (``title``, ``description``, ``content`` and optional
+                ``course_id``, ``stream_id``, ``order`` or extra parameters).
+            window: Maximum requests in flight. Defaults to the pool size.
+            on_result: Optional ``on_result(index, outcome)`` progress callback.
+        
+        Returns:
+            One ``{'success', 'result', 'error'}`` dictionary per lesson, in input order.
+        """
+        return self._run_batch(self.create_lesson, lessons, window, on_result)
+    
+    def update_lessons(
+        self,
+        lessons: Iterable[Dict],
+        window: Optional[int] = None,
+        on_result: Optional[Callable[[int, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Update many lessons, pipelined over the pooled connection.
+        
+        Failures are collected per item instead of stopping the batch.
+        
+        Args:
+            lessons: Iterable of dictionaries with ``update_lesson`` arguments
+                (``lesson_id`` and any fields to change).
+            window: Maximum requests in flight. Defaults to the pool size.
+            on_result: Optional ``on_result(index, outcome)`` progress callback.
+        
+        Returns:
+            One ``{'success', 'result', 'error'}`` dictionary per lesson, in input order.
+        """
+        return self._run_batch(self.update_lesson, lessons, window, on_result)
+    
+    def upsert_lesson(self, lesson_id: Optional[str] = None, **fields) -> Dict:
+        """
+        Update the lesson if ``lesson_id`` is given, create it otherwise.
+        
+        Args:
+            lesson_id: Existing lesson ID, or None to create a new lesson.
+            **fields: ``update_lesson`` or ``create_lesson`` arguments.
+        
+        Returns:
+            Created or updated lesson data.
+        """
+        if lesson_id:
+            return self.update_lesson(lesson_id, **fields)
+        return self.create_lesson(**fields)
+    
     def create_course(
         self,
         title: str,
@@ -205,10 +854,6 @@ class GetCourseAPI:
         Returns:
             Created course data.
         """
-        params = {
-            "title": title,
-            "description": description,
-        }
-        params.update(kwargs)
+        params = self._course_params(title, description, **kwargs)
         
-        return self._make_request("courses.create", params)
\ No newline at end of file
+        return self._make_request("courses.create", params)
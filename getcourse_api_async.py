@@ -0,0 +1,354 @@
+"""Asyncio GetCourse API client for publishing many lessons concurrently."""
+import asyncio
+import aiohttp
+from typing import Dict, Optional, List
+from config import Config
+from getcourse_api import (
+    GetCourseClientBase,
+    GetCourseUnknownActionError,
+    _is_unknown_action,
+    _parse_response,
+)
+
+
+# Connect timeouts are told apart from read timeouts since aiohttp 3.10
+_CONNECT_TIMEOUT_ERRORS = getattr(aiohttp, 'ConnectionTimeoutError', ())
+
+
+def _is_read_timeout(error: Exception) -> bool:
+    """Whether a connection error is a timeout that may follow a sent request."""
+    if isinstance(error, _CONNECT_TIMEOUT_ERRORS):
+        return False
+    # ServerTimeoutError and SocketTimeoutError subclass ClientConnectionError
+    return isinstance(error, (aiohttp.ServerTimeoutError, asyncio.TimeoutError))
+
+
+class AsyncGetCourseAPI(GetCourseClientBase):
+    """
+    Asyncio client for interacting with GetCourse API.
+    
+    Mirrors ``GetCourseAPI`` but runs requests as coroutines: up to
+    ``max_concurrency`` actions are in flight at once, all sharing one
+    keep-alive ``aiohttp`` connection pool. Use it as an async context manager
+    or call ``close()`` when done.
+    """
+    
+    def __init__(
+        self,
+        api_key=None,
+        account=None,
+        api_url=None,
+        pool_size: Optional[int] = None,
+        connect_timeout: Optional[float] = None,
+        read_timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        action_cache_file: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        rate_burst: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        use_cache: bool = True
+    ):
+        super().__init__(
+            api_key=api_key,
+            account=account,
+            api_url=api_url,
+            pool_size=pool_size,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            action_cache_file=action_cache_file,
+            rate_limit=rate_limit,
+            rate_burst=rate_burst,
+            max_retries=max_retries,
+            use_cache=use_cache
+        )
+        self.max_concurrency = max_concurrency or Config.GETCOURSE_MAX_CONCURRENCY
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout
+        )
+        
+        # Created lazily, because both must belong to the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._probe_lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared session backed by a bounded keep-alive connection pool."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._probe_lock = asyncio.Lock()
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
+        self._probe_lock = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _make_request(
+        self,
+        action: str,
+        params: Optional[Dict] = None,
+        method: str = "POST"
+    ) -> Dict:
+        """
+        Make a request to GetCourse API.
+        
+        Args:
+            action: API action name.
+            params: Request parameters.
+            method: HTTP method (POST or GET).
+        
+        Returns:
+            API response as dictionary.
+        """
+        payload = self._build_payload(params)
+        payload["action"] = action
+        return await self._send(payload, method)
+    
+    async def _make_request_with_fallback(
+        self,
+        operation: str,
+        actions: tuple,
+        params: Optional[Dict] = None,
+        method: str = "POST"
+    ) -> Dict:
+        """
+        Make a request using the first action name the account supports.
+        
+        Same semantics as ``GetCourseAPI._make_request_with_fallback``; the
+        resolved action names are shared with the sync client.
+        
+        Args:
+            operation: Logical operation name used as the cache key.
+            actions: Candidate action names in probing order.
+            params: Request parameters.
+            method: HTTP method (POST or GET).
+        
+        Returns:
+            API response as dictionary.
+        """
+        self.session  # make sure the probe lock exists for this loop
+        if self._known_action(operation) is None:
+            async with self._probe_lock:
+                return await self._try_actions(operation, actions, params, method)
+        return await self._try_actions(operation, actions, params, method)
+    
+    async def _try_actions(
+        self,
+        operation: str,
+        actions: tuple,
+        params: Optional[Dict] = None,
+        method: str = "POST"
+    ) -> Dict:
+        """Try candidate action names in order until one is accepted."""
+        candidates = self._candidate_actions(operation, actions)
+        payload = self._build_payload(params)
+        last_error = None
+        for action in candidates:
+            payload["action"] = action
+            try:
+                result = await self._send(payload, method)
+            except GetCourseUnknownActionError as e:
+                last_error = e
+                if action == candidates[0]:
+                    self._remember_action(operation, None)
+                continue
+            self._remember_action(operation, action)
+            return result
+        
+        raise last_error
+    
+    async def _send(self, payload: Dict, method: str = "POST") -> Dict:
+        """
+        Send a prepared payload to the actions endpoint.
+        
+        Args:
+            payload: Form payload including ``key`` and ``action``.
+            method: HTTP method (POST or GET).
+        
+        Returns:
+            API response as dictionary.
+        """
+        url = self.actions_url
+        session = self.session
+        retry_statuses = self._retry_statuses(payload["action"])
+        
+        cached = self._cached_response(payload)
+        if cached is not None:
+            return cached
+        
+        # aiohttp only accepts str/int/float form values
+        form = {k: v if isinstance(v, (str, int, float)) else str(v) for k, v in payload.items()}
+        
+        try:
+            attempt = 0
+            while True:
+                await asyncio.sleep(self._reserve_slot())
+                try:
+                    async with self._semaphore:
+                        if method.upper() == "POST":
+                            # GetCourse API typically expects form data
+                            request = session.post(url, data=form)
+                        else:
+                            request = session.get(url, params=form)
+                        
+                        async with request as response:
+                            text = await response.text()
+                except aiohttp.ClientConnectionError as e:
+                    # Same rule as the sync client: connection failures are
+                    # retried, read timeouts are not, since the action may
+                    # already have run
+                    if _is_read_timeout(e):
+                        raise
+                    delay = self._retry_delay(attempt)
+                    if delay is None:
+                        raise
+                else:
+                    delay = self._retry_delay(
+                        attempt, response.status, response.headers.get('Retry-After')
+                    ) if response.status in retry_statuses else None
+                    if delay is None:
+                        break
+                attempt += 1
+                await asyncio.sleep(delay)
+            
+            if _is_unknown_action(response.ok, text):
+                raise GetCourseUnknownActionError(payload["action"], text[:200])
+            
+            if not response.ok:
+                print(f"Response status: {response.status}")
+                print(f"Response text: {text}")
+            response.raise_for_status()
+            
+            result = _parse_response(text)
+            self._update_cache(payload, text, result)
+            return result
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"API request failed: {e!r}")
+            raise
+    
+    async def create_lesson(
+        self,
+        title: str,
+        description: str,
+        content: str,
+        course_id: Optional[str] = None,
+        stream_id: Optional[str] = None,
+        order: Optional[int] = None,
+        **kwargs
+    ) -> Dict:
+        """
+        Create a lesson in GetCourse.
+        
+        Args:
+            title: Lesson title.
+            description: Lesson description.
+            content: Lesson content (HTML or text).
+            course_id: Course ID to attach lesson to.
+            stream_id: Stream ID (from URL like /stream/view/id/934935666).
+            order: Lesson order in course.
+            **kwargs: Additional lesson parameters.
+        
+        Returns:
+            Created lesson data.
+        """
+        params = self._lesson_params(
+            title, description, content,
+            course_id=course_id, stream_id=stream_id, order=order, **kwargs
+        )
+        
+        # Different accounts accept different action names
+        return await self._make_request_with_fallback(
+            "create_lesson",
+            self.LESSON_CREATE_ACTIONS,
+            params
+        )
+    
+    async def update_lesson(
+        self,
+        lesson_id: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        content: Optional[str] = None,
+        **kwargs
+    ) -> Dict:
+        """
+        Update an existing lesson in GetCourse.
+        
+        Args:
+            lesson_id: Lesson ID to update.
+            title: New lesson title.
+            description: New lesson description.
+            content: New lesson content.
+            **kwargs: Additional lesson parameters.
+        
+        Returns:
+            Updated lesson data.
+        """
+        params = self._update_params(
+            lesson_id, title=title, description=description, content=content, **kwargs
+        )
+        
+        return await self._make_request("lessons.update", params)
+    
+    async def list_lessons(self, course_id: Optional[str] = None) -> List[Dict]:
+        """
+        List lessons in GetCourse.
+        
+        Args:
+            course_id: Optional course ID to filter lessons.
+        
+        Returns:
+            List of lessons.
+        """
+        params = {}
+        if course_id:
+            params["course_id"] = course_id
+        
+        response = await self._make_request("lessons.list", params)
+        return response.get("lessons", [])
+    
+    async def get_lesson(self, lesson_id: str) -> Dict:
+        """
+        Get lesson details.
+        
+        Args:
+            lesson_id: Lesson ID.
+        
+        Returns:
+            Lesson data.
+        """
+        return await self._make_request("lessons.get", {"lesson_id": lesson_id})
+    
+    async def create_course(
+        self,
+        title: str,
+        description: str,
+        **kwargs
+    ) -> Dict:
+        """
+        Create a course in GetCourse.
+        
+        Args:
+            title: Course title.
+            description: Course description.
+            **kwargs: Additional course parameters.
+        
+        Returns:
+            Created course data.
+        """
+        params = self._course_params(title, description, **kwargs)
+        
+        return await self._make_request("courses.create", params)
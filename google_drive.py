@@ -1,21 +1,339 @@
 """Google Drive integration for fetching lessons."""
+import codecs
+import io
+import json
 import os
 import pickle
-from typing import List, Dict, Optional
-from google.auth.transport.requests import Request
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
 from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, MediaIoBaseDownload, build_http
+from cache import TTLCache
 from config import Config
+from content_cache import ContentCache
+from rate_limiter import RetryPolicy
+from token_manager import shared_token_manager
+
+
+# Fields returned by get_file_metadata / get_files_metadata
+FILE_METADATA_FIELDS = "id, name, mimeType, size, modifiedTime, md5Checksum, webViewLink, description"
+
+# Drive accepts at most 100 calls in one batch request
+DRIVE_BATCH_LIMIT = 100
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Fields returned for each file in folder listings
+LIST_FIELDS = "id, name, mimeType, size, modifiedTime, md5Checksum, webViewLink"
+
+# Largest page size files.list accepts
+MAX_PAGE_SIZE = 1000
+
+# Parsed discovery documents, keyed by (api, version)
+_discovery_docs: Dict[Tuple[str, str], Dict] = {}
+_discovery_lock = threading.Lock()
+
+# Service objects keyed by (api, version, access token)
+_services = TTLCache(max_entries=256, ttl=3600)
+
+# httplib2 connections are not thread-safe; each thread keeps its own
+_thread_http = threading.local()
+
+
+def discovery_document(api: str, version: str) -> Optional[Dict]:
+    """
+    Get the parsed discovery document bundled with googleapiclient.
+    
+    The document is parsed once per process. Building a service mutates
+    the document the first time each method is created, so a warm-up build
+    creates every method up front; afterwards concurrent builds only read it.
+    
+    Args:
+        api: API name, e.g. 'drive'.
+        version: API version, e.g. 'v3'.
+    
+    Returns:
+        Discovery document, or None if no static copy is bundled.
+    """
+    key = (api, version)
+    doc = _discovery_docs.get(key)
+    if doc is None:
+        with _discovery_lock:
+            doc = _discovery_docs.get(key)
+            if doc is None:
+                raw = discovery_cache.get_static_doc(api, version)
+                if raw is None:
+                    return None
+                doc = json.loads(raw)
+                _create_methods(build_from_document(doc, http=build_http()), doc)
+                _discovery_docs[key] = doc
+    return doc
+
+
+def _create_methods(resource, description: Dict) -> None:
+    for name, child in description.get('resources', {}).items():
+        _create_methods(getattr(resource, name)(), child)
+
+
+def _request_builder(credentials):
+    """Make a request factory sending every call over the current thread's connection."""
+    def build_request(http, *args, **kwargs):
+        transport = getattr(_thread_http, 'http', None)
+        if transport is None:
+            transport = _thread_http.http = build_http()
+        return HttpRequest(AuthorizedHttp(credentials, http=transport), *args, **kwargs)
+    return build_request
+
+
+def build_service(api: str, version: str, credentials):
+    """
+    Build a thread-safe Google API service object.
+    
+    Uses the pre-parsed static discovery document, and sends requests over
+    a per-thread connection so one object can be shared between threads.
+    
+    Args:
+        api: API name, e.g. 'drive'.
+        version: API version, e.g. 'v3'.
+        credentials: google-auth credentials.
+    
+    Returns:
+        Service object.
+    """
+    doc = discovery_document(api, version)
+    if doc is None:
+        return build(api, version, credentials=credentials)
+    return build_from_document(doc, credentials=credentials, requestBuilder=_request_builder(credentials))
+
+
+def cached_service(api: str, version: str, credentials):
+    """
+    Get a service object for the credentials, reusing a cached one.
+    
+    Entries are keyed by access token, so a refreshed token gets a new
+    service object and the old one ages out of the cache.
+    
+    Args:
+        api: API name, e.g. 'drive'.
+        version: API version, e.g. 'v3'.
+        credentials: google-auth credentials.
+    
+    Returns:
+        Service object.
+    """
+    key = (api, version, credentials.token)
+    service = _services.get(key)
+    if service is None:
+        service = build_service(api, version, credentials)
+        _services.set(key, service)
+    return service
+
+
+# Called as progress(bytes_downloaded, total_bytes_or_None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def iter_media_chunks(
+    request,
+    chunk_size: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    num_retries: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Stream a Drive media request chunk by chunk.
+    
+    Each chunk is fetched with its own ranged request, so only one chunk is
+    held in memory at a time. Transient failures (5xx, 429, dropped
+    connections) are retried with backoff and resume from the last byte
+    received rather than from the start of the file.
+    
+    Args:
+        request: Media request from ``files().get_media`` or ``files().export_media``.
+        chunk_size: Bytes per chunk. Uses config default if None.
+        progress: Optional callback receiving bytes downloaded and total size.
+        num_retries: Retries per chunk. Uses config default if None.
+    
+    Yields:
+        Chunks of file content.
+    """
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, request, chunksize=chunk_size or Config.DRIVE_CHUNK_SIZE)
+    if num_retries is None:
+        num_retries = Config.DRIVE_DOWNLOAD_RETRIES
+    
+    done = False
+    while not done:
+        status, done = downloader.next_chunk(num_retries=num_retries)
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        if progress and status:
+            progress(status.resumable_progress, status.total_size)
+        if chunk:
+            yield chunk
+
+
+def iter_folder_files(service, folder_id: str, page_size: Optional[int] = None) -> Iterator[Dict]:
+    """
+    Yield the files of a Drive folder page by page.
+    
+    Only one page is held at a time, so callers can start on the first
+    files while later pages are still being fetched.
+    
+    Args:
+        service: Drive v3 service object.
+        folder_id: Google Drive folder ID.
+        page_size: Files per page, at most 1000. Uses config default if None.
+    
+    Yields:
+        File metadata dictionaries.
+    """
+    page_size = min(page_size or Config.DRIVE_PAGE_SIZE, MAX_PAGE_SIZE)
+    query = f"'{folder_id}' in parents and trashed=false"
+    page_token = None
+    
+    while True:
+        results = service.files().list(
+            q=query,
+            pageSize=page_size,
+            fields=f"nextPageToken, files({LIST_FIELDS})",
+            pageToken=page_token
+        ).execute()
+        
+        yield from results.get('files', [])
+        page_token = results.get('nextPageToken')
+        
+        if not page_token:
+            break
+
+
+def get_folder_file(
+    service,
+    file_id: str,
+    folder_ids: Iterable[str],
+    recursive: bool = False
+) -> Optional[Dict]:
+    """
+    Look up one file by ID and check that it lives in one of the folders.
+    
+    Costs one ``files.get`` (plus one per folder level when ``recursive``)
+    no matter how many files the folders hold.
+    
+    Args:
+        service: Drive v3 service object.
+        file_id: Google Drive file ID.
+        folder_ids: Folders the file must be in.
+        recursive: Also accept files in subfolders of ``folder_ids``.
+    
+    Returns:
+        File metadata dictionary, or None if the file does not exist, is
+        trashed or is outside the folders.
+    """
+    folder_ids = set(folder_ids)
+    try:
+        file = service.files().get(
+            fileId=file_id,
+            fields=f"{FILE_METADATA_FIELDS}, parents, trashed"
+        ).execute()
+    except HttpError as error:
+        if error.resp.status == 404:
+            return None
+        raise
+    
+    if file.pop('trashed', False):
+        return None
+    
+    parents = file.pop('parents', [])
+    seen = set()
+    while parents:
+        if folder_ids.intersection(parents):
+            return file
+        if not recursive:
+            return None
+        # Walk up one level (Drive items have a single parent)
+        parent_id = parents[0]
+        if parent_id in seen:
+            return None
+        seen.add(parent_id)
+        try:
+            parents = service.files().get(fileId=parent_id, fields="parents").execute().get('parents', [])
+        except HttpError as error:
+            if error.resp.status == 404:
+                return None
+            raise
+    return None
+
+
+def _is_transient(error: Exception) -> bool:
+    """Check whether a failed Drive call is worth retrying."""
+    if not isinstance(error, HttpError):
+        return False
+    status = error.resp.status
+    if status in RetryPolicy.RETRY_STATUSES:
+        return True
+    # Drive reports per-user rate limiting as 403
+    return status == 403 and 'ratelimitexceeded' in str(error).lower()
+
+
+def decode_chunks(chunks: Iterable[bytes]) -> str:
+    """
+    Decode streamed UTF-8 chunks, including characters split across chunks.
+    
+    Args:
+        chunks: Byte chunks, e.g. from ``iter_media_chunks``.
+    
+    Returns:
+        Decoded text; invalid bytes are ignored.
+    """
+    return ''.join(iter_decoded_chunks(chunks))
+
+
+def iter_decoded_chunks(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Decode streamed UTF-8 chunks one by one.
+    
+    Args:
+        chunks: Byte chunks, e.g. from ``iter_media_chunks``.
+    
+    Yields:
+        Text chunks; characters split across byte chunks are joined and
+        invalid bytes are ignored.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def _save_token(credentials) -> None:
+    """Save CLI credentials for the next run."""
+    with open(Config.GOOGLE_TOKEN_FILE, 'wb') as token:
+        pickle.dump(credentials, token)
 
 
 class GoogleDriveClient:
-    """Client for interacting with Google Drive API."""
+    """
+    Client for interacting with Google Drive API.
     
-    def __init__(self):
-        self.service = None
+    The service object is shared between threads; requests go over a
+    per-thread connection (see ``build_service``).
+    """
+    
+    def __init__(self, content_cache: Optional[ContentCache] = None):
+        """
+        Args:
+            content_cache: Optional disk cache for downloads and exports.
+        """
         self.credentials = None
+        self.service = None
+        self.content_cache = content_cache
         self._authenticate()
     
     def _authenticate(self):
@@ -27,76 +345,142 @@ class GoogleDriveClient:
             with open(Config.GOOGLE_TOKEN_FILE, 'rb') as token:
                 creds = pickle.load(token)
         
-        # If there are no (valid) credentials available, let the user log in
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists(Config.GOOGLE_CREDENTIALS_FILE):
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {Config.GOOGLE_CREDENTIALS_FILE}\n"
-                        "Please download it from Google Cloud Console."
-                    )
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    Config.GOOGLE_CREDENTIALS_FILE, Config.SCOPES
+        # Without a refresh token, let the user log in
+        if not creds or not creds.refresh_token:
+            if not os.path.exists(Config.GOOGLE_CREDENTIALS_FILE):
+                raise FileNotFoundError(
+                    f"Credentials file not found: {Config.GOOGLE_CREDENTIALS_FILE}\n"
+                    "Please download it from Google Cloud Console."
                 )
-                creds = flow.run_local_server(port=0)
-            
-            # Save credentials for next run
-            with open(Config.GOOGLE_TOKEN_FILE, 'wb') as token:
-                pickle.dump(creds, token)
+            flow = InstalledAppFlow.from_client_secrets_file(
+                Config.GOOGLE_CREDENTIALS_FILE, Config.SCOPES
+            )
+            creds = flow.run_local_server(port=0)
+            _save_token(creds)
         
-        self.credentials = creds
-        self.service = build('drive', 'v3', credentials=creds)
+        # The shared token manager refreshes the token in the background
+        # before it expires and saves every new one for the next run
+        token_manager = shared_token_manager()
+        token_manager.register(Config.GOOGLE_TOKEN_FILE, creds, on_refresh=_save_token)
+        self.credentials = token_manager.get(Config.GOOGLE_TOKEN_FILE)
+        self.service = build_service('drive', 'v3', self.credentials)
     
     def list_files_in_folder(self, folder_id: Optional[str] = None) -> List[Dict]:
         """
         List all files in a Google Drive folder.
         
         Args:
-            folder_id: Google Drive folder ID. Uses config default if None.
+            folder_id: Google Drive folder ID. Uses the first configured
+                folder if None.
         
         Returns:
             List of file metadata dictionaries.
         """
-        folder_id = folder_id or Config.GOOGLE_DRIVE_FOLDER_ID
+        return list(self.iter_files_in_folder(folder_id))
+    
+    def iter_files_in_folder(
+        self,
+        folder_id: Optional[str] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield the files in a Google Drive folder as listing pages arrive.
+        
+        Args:
+            folder_id: Google Drive folder ID. Uses the first configured
+                folder if None.
+            page_size: Files per page, at most 1000. Uses config default if None.
+        
+        Yields:
+            File metadata dictionaries.
+        """
+        # GOOGLE_DRIVE_FOLDER_ID may hold several comma-separated IDs
+        folder_id = folder_id or next(iter(Config.get_drive_folder_ids()), None)
         if not folder_id:
             raise ValueError("Folder ID is required")
         
         try:
-            files = []
-            page_token = None
-            
-            while True:
-                query = f"'{folder_id}' in parents and trashed=false"
-                results = self.service.files().list(
-                    q=query,
-                    pageSize=100,
-                    fields="nextPageToken, files(id, name, mimeType, size, modifiedTime, webViewLink)",
-                    pageToken=page_token
-                ).execute()
-                
-                files.extend(results.get('files', []))
-                page_token = results.get('nextPageToken')
-                
-                if not page_token:
-                    break
-            
-            return files
+            yield from iter_folder_files(self.service, folder_id, page_size)
         except HttpError as error:
             print(f"An error occurred: {error}")
             raise
     
-    def get_file_content(self, file_id: str) -> bytes:
+    def list_files_recursive(
+        self,
+        folder_ids: Iterable[str],
+        max_workers: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        List all files under one or more folders, including subfolders.
+        
+        Subfolders are listed concurrently as soon as they are discovered,
+        so the traversal takes about as long as the deepest folder chain
+        rather than the sum of all folders.
+        
+        Args:
+            folder_ids: Root folder IDs.
+            max_workers: Folders listed in parallel. Uses config default if None.
+        
+        Returns:
+            List of file metadata dictionaries (folders excluded), each with
+            ``folder_id`` and ``folder_path`` ("Root/Module/..."), sorted by
+            path and name.
+        """
+        roots = list(dict.fromkeys(folder_ids))
+        if not roots:
+            raise ValueError("Folder ID is required")
+        
+        names = self.get_files_metadata(roots, fields="id, name")
+        files = []
+        seen = set(roots)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or Config.DRIVE_LIST_WORKERS) as executor:
+            pending = {}
+            for folder_id in roots:
+                entry = names.get(folder_id)
+                path = entry['result']['name'] if entry and entry['success'] else folder_id
+                pending[executor.submit(self.list_files_in_folder, folder_id)] = (folder_id, path)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder_id, path = pending.pop(future)
+                    for item in future.result():
+                        if item.get('mimeType') != FOLDER_MIME_TYPE:
+                            files.append({**item, 'folder_id': folder_id, 'folder_path': path})
+                        elif item['id'] not in seen:
+                            seen.add(item['id'])
+                            subfolder = (item['id'], f"{path}/{item['name']}")
+                            pending[executor.submit(self.list_files_in_folder, item['id'])] = subfolder
+        
+        files.sort(key=lambda f: (f['folder_path'], f['name']))
+        return files
+    
+    def get_file_content(
+        self,
+        file_id: str,
+        modified_time: Optional[str] = None,
+        md5_checksum: Optional[str] = None
+    ) -> bytes:
         """
         Download file content from Google Drive.
         
         Args:
             file_id: Google Drive file ID.
+            modified_time: File ``modifiedTime``; enables the content cache.
+            md5_checksum: File ``md5Checksum``; lets identical files share
+                a cache entry.
         
         Returns:
             File content as bytes.
         """
+        if self.content_cache and modified_time:
+            return self.content_cache.fetch(
+                ContentCache.make_key(file_id, modified_time),
+                lambda: self.get_file_content(file_id),
+                md5_checksum
+            )
+        
         try:
             request = self.service.files().get_media(fileId=file_id)
             content = request.execute()
@@ -105,6 +489,95 @@ class GoogleDriveClient:
             print(f"An error occurred: {error}")
             raise
     
+    def stream_file_content(
+        self,
+        file_id: str,
+        chunk_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Iterator[bytes]:
+        """
+        Download file content from Google Drive in chunks.
+        
+        Args:
+            file_id: Google Drive file ID.
+            chunk_size: Bytes per chunk. Uses config default if None.
+            progress: Optional callback receiving bytes downloaded and total size.
+        
+        Yields:
+            Chunks of file content.
+        """
+        try:
+            request = self.service.files().get_media(fileId=file_id)
+            yield from iter_media_chunks(request, chunk_size, progress)
+        except HttpError as error:
+            print(f"An error occurred: {error}")
+            raise
+    
+    def stream_export(
+        self,
+        file_id: str,
+        mime_type: str,
+        chunk_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Iterator[bytes]:
+        """
+        Export a Google Workspace file in chunks.
+        
+        Args:
+            file_id: Google Drive file ID.
+            mime_type: Target MIME type (e.g., 'text/plain', 'application/pdf').
+            chunk_size: Bytes per chunk. Uses config default if None.
+            progress: Optional callback receiving bytes downloaded and total size.
+        
+        Yields:
+            Chunks of exported content.
+        """
+        try:
+            request = self.service.files().export_media(fileId=file_id, mimeType=mime_type)
+            yield from iter_media_chunks(request, chunk_size, progress)
+        except HttpError as error:
+            print(f"An error occurred: {error}")
+            raise
+    
+    def download_to_file(
+        self,
+        file_id: str,
+        path: str,
+        mime_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """
+        Download a file to disk without holding it in memory.
+        
+        The content is written to ``<path>.part`` and renamed once complete,
+        so ``path`` never holds a truncated file.
+        
+        Args:
+            file_id: Google Drive file ID.
+            path: Destination file path.
+            mime_type: Export MIME type for Google Workspace files; None
+                downloads the file as stored.
+            chunk_size: Bytes per chunk. Uses config default if None.
+            progress: Optional callback receiving bytes downloaded and total size.
+        
+        Returns:
+            Number of bytes written.
+        """
+        if mime_type:
+            chunks = self.stream_export(file_id, mime_type, chunk_size, progress)
+        else:
+            chunks = self.stream_file_content(file_id, chunk_size, progress)
+        
+        partial_path = f"{path}.part"
+        written = 0
+        with open(partial_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(partial_path, path)
+        return written
+    
     def get_file_metadata(self, file_id: str) -> Dict:
         """
         Get file metadata.
@@ -118,28 +591,156 @@ class GoogleDriveClient:
         try:
             file = self.service.files().get(
                 fileId=file_id,
-                fields="id, name, mimeType, size, modifiedTime, webViewLink, description"
+                fields=FILE_METADATA_FIELDS
             ).execute()
             return file
         except HttpError as error:
             print(f"An error occurred: {error}")
             raise
     
-    def export_file(self, file_id: str, mime_type: str) -> bytes:
+    def get_file_in_folder(
+        self,
+        file_id: str,
+        folder_ids: Optional[Iterable[str]] = None,
+        recursive: bool = False
+    ) -> Optional[Dict]:
+        """
+        Get a file's metadata if it is inside the given folders.
+        
+        Args:
+            file_id: Google Drive file ID.
+            folder_ids: Allowed folders. Uses the configured folders if None.
+            recursive: Also accept files in subfolders.
+        
+        Returns:
+            File metadata dictionary, or None if not found in the folders.
+        """
+        folder_ids = folder_ids or Config.get_drive_folder_ids()
+        try:
+            return get_folder_file(self.service, file_id, folder_ids, recursive)
+        except HttpError as error:
+            print(f"An error occurred: {error}")
+            raise
+    
+    def get_files_metadata(self, file_ids: Iterable[str], fields: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        Get metadata for many files using Drive batch requests.
+        
+        Calls are grouped up to 100 per HTTP request. Items that fail with
+        a transient error (rate limiting, 5xx) are retried in a new batch
+        with backoff; other failures are reported per item.
+        
+        Args:
+            file_ids: Google Drive file IDs.
+            fields: Fields to return. Defaults to the ``get_file_metadata`` fields.
+        
+        Returns:
+            Dictionary keyed by file ID; each value has ``success``, ``result``
+            (metadata dictionary) and ``error`` (message or None).
+        """
+        fields = fields or FILE_METADATA_FIELDS
+        pending = list(dict.fromkeys(file_ids))
+        results: Dict[str, Dict] = {}
+        policy = RetryPolicy(max_retries=Config.DRIVE_DOWNLOAD_RETRIES)
+        attempt = 0
+        
+        while pending:
+            retry: List[str] = []
+            
+            def callback(request_id, response, exception):
+                if exception is None:
+                    results[request_id] = {'success': True, 'result': response, 'error': None}
+                    return
+                results[request_id] = {'success': False, 'result': None, 'error': str(exception)}
+                if _is_transient(exception):
+                    retry.append(request_id)
+            
+            try:
+                for start in range(0, len(pending), DRIVE_BATCH_LIMIT):
+                    batch = self.service.new_batch_http_request(callback=callback)
+                    for file_id in pending[start:start + DRIVE_BATCH_LIMIT]:
+                        batch.add(self.service.files().get(fileId=file_id, fields=fields), request_id=file_id)
+                    batch.execute()
+            except HttpError as error:
+                print(f"An error occurred: {error}")
+                raise
+            
+            if not retry or not policy.should_retry(attempt):
+                break
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+            pending = retry
+        
+        return results
+    
+    def export_file(self, file_id: str, mime_type: str, modified_time: Optional[str] = None) -> bytes:
         """
         Export Google Workspace file (Docs, Sheets, Slides) to specified format.
         
         Args:
             file_id: Google Drive file ID.
             mime_type: Target MIME type (e.g., 'text/plain', 'application/pdf').
+            modified_time: File ``modifiedTime``; enables the content cache.
         
         Returns:
             Exported file content as bytes.
         """
+        if self.content_cache and modified_time:
+            return self.content_cache.fetch(
+                ContentCache.make_key(file_id, modified_time, mime_type),
+                lambda: self.export_file(file_id, mime_type)
+            )
+        
         try:
             request = self.service.files().export_media(fileId=file_id, mimeType=mime_type)
             content = request.execute()
             return content
         except HttpError as error:
             print(f"An error occurred: {error}")
-            raise
\ No newline at end of file
+            raise
+    
+    def get_start_page_token(self) -> str:
+        """
+        Get the current position of the Drive changes feed.
+        
+        Returns:
+            Page token to pass to ``get_changes`` later.
+        """
+        try:
+            response = self.service.changes().getStartPageToken().execute()
+            return response['startPageToken']
+        except HttpError as error:
+            print(f"An error occurred: {error}")
+            raise
+    
+    def get_changes(self, page_token: str) -> Tuple[List[Dict], str]:
+        """
+        Get all changes since a page token.
+        
+        Args:
+            page_token: Token from ``get_start_page_token`` or a previous call.
+        
+        Returns:
+            Tuple of (list of change dictionaries, token for the next call).
+        """
+        try:
+            changes = []
+            
+            while True:
+                results = self.service.changes().list(
+                    pageToken=page_token,
+                    pageSize=1000,
+                    spaces='drive',
+                    fields=(
+                        "nextPageToken, newStartPageToken, changes(fileId, removed, "
+                        "file(id, name, mimeType, size, modifiedTime, md5Checksum, webViewLink, parents, trashed))"
+                    )
+                ).execute()
+                
+                changes.extend(results.get('changes', []))
+                if 'newStartPageToken' in results:
+                    return changes, results['newStartPageToken']
+                page_token = results['nextPageToken']
+        except HttpError as error:
+            print(f"An error occurred: {error}")
+            raise
@@ -0,0 +1,148 @@
+"""Conversion of plain-text lessons to GetCourse HTML."""
+import re
+from typing import List
+
+# Documents containing one of these are passed through unchanged
+HTML_MARKER = re.compile(r'<(?:html|body)', re.IGNORECASE)
+
+# Slice size used when formatting a whole string
+FORMAT_CHUNK_CHARS = 64 * 1024
+
+EMPTY_CONTENT_HTML = "<p>No content available.</p>"
+
+CONTENT_HEADER = '<div class="lesson-content">\n            '
+
+CONTENT_FOOTER = """
+        </div>
+        <style>
+            .lesson-content {
+                font-family: Arial, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                padding: 20px;
+            }
+            .lesson-content p {
+                margin-bottom: 15px;
+            }
+        </style>"""
+
+
+class TextToHtml:
+    """
+    Incremental plain text to lesson HTML converter.
+    
+    Text is split into paragraphs on blank lines (``\\n\\n``); each paragraph
+    is stripped, its remaining line breaks become ``<br>`` and it is wrapped
+    in ``<p>``. The paragraphs go inside the styled ``lesson-content`` block.
+    
+    Only a possible half of a paragraph separator and trailing whitespace
+    that may still be stripped are held between chunks, so memory stays
+    proportional to the chunk size however long the document or its
+    paragraphs are.
+    """
+    
+    def __init__(self):
+        self._carry = ''
+        self._pending_ws = ''
+        self._in_paragraph = False
+        self._started = False
+    
+    def feed(self, text: str) -> str:
+        """
+        Convert the next chunk of text.
+        
+        Args:
+            text: Text chunk.
+        
+        Returns:
+            HTML for the part of the text that is complete; may be empty.
+        """
+        out: List[str] = []
+        text = self._carry + text
+        start = 0
+        while True:
+            end = text.find('\n\n', start)
+            if end < 0:
+                break
+            self._add_text(text[start:end], out)
+            self._end_paragraph(out)
+            start = end + 2
+        
+        # A trailing newline may be the first half of a separator
+        if text.endswith('\n') and len(text) > start:
+            self._carry = '\n'
+            self._add_text(text[start:-1], out)
+        else:
+            self._carry = ''
+            self._add_text(text[start:], out)
+        return ''.join(out)
+    
+    def close(self) -> str:
+        """
+        Finish the document.
+        
+        Returns:
+            The remaining HTML, or the "no content" placeholder if the text
+            was empty or whitespace only.
+        """
+        out: List[str] = []
+        self._add_text(self._carry, out)
+        self._carry = ''
+        self._end_paragraph(out)
+        if not self._started:
+            return EMPTY_CONTENT_HTML
+        out.append(CONTENT_FOOTER)
+        return ''.join(out)
+    
+    def _add_text(self, text: str, out: List[str]) -> None:
+        """Add text belonging to the current paragraph."""
+        if not self._in_paragraph:
+            text = text.lstrip()
+            if not text:
+                return
+            if not self._started:
+                out.append(CONTENT_HEADER)
+                self._started = True
+            out.append('<p>')
+            self._in_paragraph = True
+        
+        body = text.rstrip()
+        if not body:
+            self._pending_ws += text
+            return
+        if self._pending_ws:
+            out.append(self._pending_ws.replace('\n', '<br>\n'))
+        out.append(body.replace('\n', '<br>\n'))
+        # Dropped if the paragraph ends here, emitted if more text follows
+        self._pending_ws = text[len(body):]
+    
+    def _end_paragraph(self, out: List[str]) -> None:
+        if self._in_paragraph:
+            out.append('</p>')
+            self._in_paragraph = False
+        self._pending_ws = ''
+
+
+def format_text(content: str) -> str:
+    """
+    Convert a whole plain-text document to lesson HTML.
+    
+    HTML documents (containing ``<html`` or ``<body`` anywhere) are returned
+    unchanged. The text is converted in slices, without lower-cased or
+    split copies of the whole document.
+    
+    Args:
+        content: Document text.
+    
+    Returns:
+        HTML content.
+    """
+    if HTML_MARKER.search(content):
+        return content
+    converter = TextToHtml()
+    parts = [
+        converter.feed(content[i:i + FORMAT_CHUNK_CHARS])
+        for i in range(0, len(content), FORMAT_CHUNK_CHARS)
+    ]
+    parts.append(converter.close())
+    return ''.join(parts)
@@ -0,0 +1,248 @@
+"""Background job execution for long-running web requests."""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function to stop after a cancellation request."""
+
+
+class Job:
+    """State and progress of one background job."""
+    
+    def __init__(self, owner: str, kind: str):
+        """
+        Args:
+            owner: ID of the user who started the job.
+            kind: Job type, e.g. 'process-all'.
+        """
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.kind = kind
+        self.status = 'queued'
+        self.total = 0
+        self.processed = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict] = []
+        self.run_id: Optional[str] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancel.is_set()
+    
+    @property
+    def finished(self) -> bool:
+        """Whether the job has stopped running."""
+        return self.status in ('succeeded', 'failed', 'cancelled')
+    
+    def check_cancelled(self) -> None:
+        """Raise ``JobCancelled`` if cancellation was requested."""
+        if self.cancelled:
+            raise JobCancelled()
+    
+    def add_total(self, count: int = 1) -> None:
+        """Count newly discovered work items."""
+        with self._lock:
+            self.total += count
+    
+    def record(self, success: bool, error: Optional[str] = None) -> None:
+        """
+        Record one finished work item.
+        
+        Args:
+            success: Whether the item succeeded.
+            error: Error message for a failed item.
+        """
+        with self._lock:
+            if success:
+                self.processed += 1
+            else:
+                self.failed += 1
+                if error:
+                    self.errors.append(error)
+    
+    def emit(self, event: str, **data) -> None:
+        """
+        Append an event to the job's event log and wake up listeners.
+        
+        Args:
+            event: Event type, e.g. 'fetched' or 'failed'.
+            **data: JSON-serializable event payload.
+        """
+        with self._changed:
+            self.events.append({'id': len(self.events) + 1, 'event': event, 'time': time.time(), **data})
+            self._changed.notify_all()
+    
+    def wait_events(self, after: int = 0, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Get events newer than ``after``, waiting for one if there are none yet.
+        
+        Args:
+            after: ID of the last event the caller has seen.
+            timeout: Maximum seconds to wait.
+        
+        Returns:
+            New events; empty if the timeout expired or the job finished
+            without emitting more.
+        """
+        with self._changed:
+            if len(self.events) <= after and not self.finished:
+                self._changed.wait(timeout)
+            return self.events[after:]
+    
+    def to_dict(self) -> Dict:
+        """Return the job state as a JSON-serializable dictionary."""
+        with self._lock:
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'total': self.total,
+                'processed': self.processed,
+                'failed': self.failed,
+                'errors': list(self.errors),
+                'result': self.result,
+                'error': self.error,
+                'cancel_requested': self.cancelled,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'run_id': self.run_id,
+            }
+
+
+class JobManager:
+    """
+    Runs jobs on an in-process worker pool.
+    
+    Jobs are queued behind ``max_workers`` threads, so bulk work never
+    occupies web request threads. Finished jobs are kept for status
+    queries until ``max_finished`` newer ones have completed.
+    """
+    
+    def __init__(self, max_workers: int = 2, max_finished: int = 100):
+        """
+        Args:
+            max_workers: Jobs running at the same time.
+            max_finished: Finished jobs kept for status queries.
+        """
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._futures: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self, owner: str, kind: str, func: Callable[..., Any], *args, **kwargs) -> Job:
+        """
+        Queue a job.
+        
+        Args:
+            owner: ID of the user starting the job.
+            kind: Job type.
+            func: Called as ``func(job, *args, **kwargs)``; its return value
+                becomes ``job.result``. Long loops should call
+                ``job.check_cancelled()`` between items.
+        
+        Returns:
+            The queued job.
+        """
+        job = Job(owner, kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._futures[job.id] = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+    
+    def get(self, job_id: str, owner: Optional[str] = None) -> Optional[Job]:
+        """
+        Get a job by ID.
+        
+        Args:
+            job_id: Job ID.
+            owner: If given, only return the job when it belongs to this user.
+        
+        Returns:
+            The job, or None.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        return job
+    
+    def list(self, owner: str) -> List[Job]:
+        """List a user's jobs, newest first."""
+        with self._lock:
+            return [job for job in reversed(self._jobs.values()) if job.owner == owner]
+    
+    def find_active(self, owner: str, kind: str) -> Optional[Job]:
+        """Get a user's queued or running job of a given type, if any."""
+        for job in self.list(owner):
+            if job.kind == kind and not job.finished:
+                return job
+        return None
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Request cancellation of a job.
+        
+        A queued job is cancelled immediately; a running one stops at its
+        next ``check_cancelled`` call.
+        
+        Returns:
+            True if the job exists and had not finished.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            future = self._futures.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if future is not None and future.cancel():
+            self._finish(job, 'cancelled')
+        return True
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=wait)
+    
+    def _run(self, job: Job, func: Callable[..., Any], args, kwargs) -> None:
+        if job.cancelled:
+            self._finish(job, 'cancelled')
+            return
+        job.status = 'running'
+        job.started_at = time.time()
+        job.emit('started')
+        try:
+            job.result = func(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, 'cancelled')
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, 'failed')
+        else:
+            self._finish(job, 'cancelled' if job.cancelled else 'succeeded')
+    
+    def _finish(self, job: Job, status: str) -> None:
+        with job._changed:
+            job.status = status
+            job.finished_at = time.time()
+            job._changed.notify_all()
+        with self._lock:
+            self._futures.pop(job.id, None)
+            finished = [j for j in self._jobs.values() if j.finished]
+            for old in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._jobs[old.id]
@@ -1,14 +1,20 @@
 """Lesson processing module that works with Google Drive service directly."""
-import re
-from typing import Dict, Optional
+import itertools
+from typing import Dict, Iterator, Optional
 from googleapiclient.discovery import Resource
+from config import Config
+from content_rules import CONTENT_RULES
+from content_cache import ContentCache
+from google_drive import decode_chunks, iter_media_chunks
+from html_formatter import format_text
 
 
 class LessonProcessor:
     """Processes and edits lesson content from Google Drive."""
     
-    def __init__(self, drive_service: Resource):
+    def __init__(self, drive_service: Resource, content_cache: Optional[ContentCache] = None):
         self.drive_service = drive_service
+        self.content_cache = content_cache
     
     def process_file(self, file_metadata: Dict) -> Dict:
         """
@@ -17,6 +23,39 @@ class LessonProcessor:
         Args:
             file_metadata: File metadata from Google Drive.
         
+        Returns:
+            Processed lesson data dictionary.
+        """
+        content = self.fetch_content(file_metadata)
+        return self.build_lesson(file_metadata, content)
+    
+    def fetch_content(self, file_metadata: Dict) -> str:
+        """
+        Download a file's content as text.
+        
+        Args:
+            file_metadata: File metadata from Google Drive.
+        
+        Returns:
+            Extracted content as string.
+        """
+        # Extract content based on file type
+        return self._extract_content(
+            file_metadata['id'],
+            file_metadata.get('mimeType', ''),
+            file_metadata.get('size'),
+            file_metadata.get('modifiedTime'),
+            file_metadata.get('md5Checksum')
+        )
+    
+    def build_lesson(self, file_metadata: Dict, content: str) -> Dict:
+        """
+        Turn downloaded content into lesson data for GetCourse.
+        
+        Args:
+            file_metadata: File metadata from Google Drive.
+            content: Content returned by ``fetch_content``.
+        
         Returns:
             Processed lesson data dictionary.
         """
@@ -24,9 +63,6 @@ class LessonProcessor:
         file_name = file_metadata['name']
         mime_type = file_metadata.get('mimeType', '')
         
-        # Extract content based on file type
-        content = self._extract_content(file_id, mime_type)
-        
         # Process and format content
         processed_content = self._format_content(content, mime_type)
         
@@ -43,32 +79,51 @@ class LessonProcessor:
             'mime_type': mime_type,
         }
     
-    def _extract_content(self, file_id: str, mime_type: str) -> str:
+    def _extract_content(
+        self,
+        file_id: str,
+        mime_type: str,
+        size: Optional[str] = None,
+        modified_time: Optional[str] = None,
+        md5_checksum: Optional[str] = None
+    ) -> str:
         """
         Extract content from file based on MIME type.
         
+        Files larger than ``Config.DRIVE_STREAM_THRESHOLD`` are downloaded
+        in chunks, and binary ones are detected from the first chunk instead
+        of being downloaded in full.
+        
         Args:
             file_id: Google Drive file ID.
             mime_type: File MIME type.
+            size: File size in bytes as reported by Drive, if known.
+            modified_time: File ``modifiedTime``, used as the cache key.
+            md5_checksum: File ``md5Checksum``, used for cache dedup.
         
         Returns:
             Extracted content as string.
         """
+        large = size is not None and int(size) > Config.DRIVE_STREAM_THRESHOLD
+        
         # Google Docs, Sheets, Slides
         if 'google-apps' in mime_type:
             if 'document' in mime_type:
-                content_bytes = self.drive_service.files().export_media(fileId=file_id, mimeType='text/plain').execute()
+                content_bytes = self._export(file_id, 'text/plain', modified_time)
             elif 'spreadsheet' in mime_type:
-                content_bytes = self.drive_service.files().export_media(fileId=file_id, mimeType='text/csv').execute()
+                content_bytes = self._export(file_id, 'text/csv', modified_time)
             elif 'presentation' in mime_type:
-                content_bytes = self.drive_service.files().export_media(fileId=file_id, mimeType='text/plain').execute()
+                content_bytes = self._export(file_id, 'text/plain', modified_time)
             else:
-                content_bytes = self.drive_service.files().export_media(fileId=file_id, mimeType='text/plain').execute()
+                content_bytes = self._export(file_id, 'text/plain', modified_time)
             return content_bytes.decode('utf-8', errors='ignore')
         
         # Text files
         elif mime_type.startswith('text/'):
-            content_bytes = self.drive_service.files().get_media(fileId=file_id).execute()
+            if large:
+                request = self.drive_service.files().get_media(fileId=file_id)
+                return decode_chunks(iter_media_chunks(request))
+            content_bytes = self._get_media(file_id, modified_time, md5_checksum)
             return content_bytes.decode('utf-8', errors='ignore')
         
         # PDF files
@@ -86,11 +141,42 @@ class LessonProcessor:
         # Default: try to get as text
         else:
             try:
-                content_bytes = self.drive_service.files().get_media(fileId=file_id).execute()
+                if large:
+                    request = self.drive_service.files().get_media(fileId=file_id)
+                    return self._read_text_stream(iter_media_chunks(request), file_id)
+                content_bytes = self._get_media(file_id, modified_time, md5_checksum)
                 return content_bytes.decode('utf-8', errors='ignore')
             except:
                 return f"[Binary file: {file_id}]"
     
+    def _get_media(self, file_id: str, modified_time: Optional[str], md5_checksum: Optional[str]) -> bytes:
+        """Download a file, going through the content cache when possible."""
+        def download():
+            return self.drive_service.files().get_media(fileId=file_id).execute()
+        
+        if self.content_cache and modified_time:
+            key = ContentCache.make_key(file_id, modified_time)
+            return self.content_cache.fetch(key, download, md5_checksum)
+        return download()
+    
+    def _export(self, file_id: str, mime_type: str, modified_time: Optional[str]) -> bytes:
+        """Export a Google Workspace file, going through the content cache when possible."""
+        def export():
+            return self.drive_service.files().export_media(fileId=file_id, mimeType=mime_type).execute()
+        
+        if self.content_cache and modified_time:
+            key = ContentCache.make_key(file_id, modified_time, mime_type)
+            return self.content_cache.fetch(key, export)
+        return export()
+    
+    def _read_text_stream(self, chunks: Iterator[bytes], file_id: str) -> str:
+        """Decode streamed chunks as text, stopping early if they look binary."""
+        first = next(chunks, b'')
+        if b'\x00' in first:
+            chunks.close()
+            return f"[Binary file: {file_id}]"
+        return decode_chunks(itertools.chain([first], chunks))
+    
     def _format_content(self, content: str, mime_type: str) -> str:
         """
         Format content for GetCourse (convert to HTML if needed).
@@ -102,46 +188,7 @@ class LessonProcessor:
         Returns:
             Formatted HTML content.
         """
-        if not content or content.strip() == "":
-            return "<p>No content available.</p>"
-        
-        # If already HTML-like, return as is
-        if '<html' in content.lower() or '<body' in content.lower():
-            return content
-        
-        # Convert plain text to HTML
-        html_content = content
-        
-        # Convert line breaks to paragraphs
-        paragraphs = html_content.split('\n\n')
-        formatted_paragraphs = []
-        
-        for para in paragraphs:
-            para = para.strip()
-            if para:
-                # Convert single line breaks to <br>
-                para = para.replace('\n', '<br>\n')
-                formatted_paragraphs.append(f"<p>{para}</p>")
-        
-        # Add basic styling
-        html = f"""
-        <div class="lesson-content">
-            {''.join(formatted_paragraphs)}
-        </div>
-        <style>
-            .lesson-content {{
-                font-family: Arial, sans-serif;
-                line-height: 1.6;
-                color: #333;
-                padding: 20px;
-            }}
-            .lesson-content p {{
-                margin-bottom: 15px;
-            }}
-        </style>
-        """
-        
-        return html.strip()
+        return format_text(content)
     
     def _extract_title(self, file_name: str, content: str) -> str:
         """
@@ -203,31 +250,16 @@ class LessonProcessor:
         """
         Enhance lesson content with additional formatting or features.
         
+        The enhancements are the rules registered in
+        ``content_rules.CONTENT_RULES``, applied in registration order with
+        one pass per rule.
+        
         Args:
             content: Original content.
-            **options: Enhancement options.
+            **options: Enhancement options; ``embed_videos=False`` or
+                ``optimize_images=False`` turns the matching rule off.
         
         Returns:
             Enhanced content.
         """
-        enhanced = content
-        
-        # Add video embeds if video links are found
-        if options.get('embed_videos', True):
-            video_pattern = r'(https?://(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)([a-zA-Z0-9_-]+))'
-            enhanced = re.sub(
-                video_pattern,
-                r'<iframe width="560" height="315" src="https://www.youtube.com/embed/\2" frameborder="0" allowfullscreen></iframe>',
-                enhanced
-            )
-        
-        # Add image optimization
-        if options.get('optimize_images', True):
-            img_pattern = r'<img([^>]+)>'
-            enhanced = re.sub(
-                img_pattern,
-                r'<img\1 style="max-width: 100%; height: auto;">',
-                enhanced
-            )
-        
-        return enhanced
\ No newline at end of file
+        return CONTENT_RULES.apply(content, options)
\ No newline at end of file
@@ -1,18 +1,32 @@
 """Main entry point for VidCourse Lesson Manager."""
 import argparse
+import itertools
 import sys
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import Iterable, Iterator, List, Dict, Optional
 from config import Config
-from google_drive import GoogleDriveClient
+from content_cache import ContentCache
+from content_rules import CONTENT_RULES
+from drive_catalog import DriveCatalog
+from google_drive import DRIVE_BATCH_LIMIT, GoogleDriveClient
 from getcourse_api import GetCourseAPI
 from lesson_processor import LessonProcessor
+from pipeline import Pipeline, Stage
+from run_history import RunHistoryStore
+from sync_state import SyncStateStore
 
 
 class VidCourseManager:
     """Main manager class for VidCourse lesson processing."""
     
-    def __init__(self):
-        """Initialize the manager with all required clients."""
+    def __init__(self, recursive: bool = False):
+        """
+        Initialize the manager with all required clients.
+        
+        Args:
+            recursive: Include files in subfolders of the configured folders.
+        """
         if not Config.validate():
             missing = Config.get_missing_config()
             print(f"❌ Missing required configuration: {', '.join(missing)}")
@@ -20,18 +34,38 @@ class VidCourseManager:
             sys.exit(1)
         
         print("🔐 Authenticating with Google Drive...")
-        self.drive_client = GoogleDriveClient()
+        content_cache = (
+            ContentCache(Config.CONTENT_CACHE_DIR, Config.CONTENT_CACHE_MAX_BYTES)
+            if Config.CONTENT_CACHE_DIR else None
+        )
+        self.drive_client = GoogleDriveClient(content_cache=content_cache)
         
         print("🔐 Connecting to GetCourse API...")
         self.getcourse_api = GetCourseAPI()
         
         self.processor = LessonProcessor(self.drive_client)
+        self.state = SyncStateStore(Config.SYNC_STATE_DB) if Config.SYNC_STATE_DB else None
+        self.catalog = DriveCatalog(Config.DRIVE_CATALOG_DB) if Config.DRIVE_CATALOG_DB else None
+        self.history = RunHistoryStore(Config.RUN_HISTORY_DB) if Config.RUN_HISTORY_DB else None
+        self.recursive = recursive
         print("✅ Initialization complete!\n")
     
+    def iter_lessons(self) -> Iterator[Dict]:
+        """Yield the available lessons from Google Drive as they are listed."""
+        folder_ids = Config.get_drive_folder_ids()
+        if self.recursive:
+            yield from self.drive_client.list_files_recursive(folder_ids)
+        elif self.catalog:
+            for folder_id in folder_ids:
+                yield from self.catalog.iter_sync(self.drive_client, folder_id)
+        else:
+            for folder_id in folder_ids:
+                yield from self.drive_client.iter_files_in_folder(folder_id)
+    
     def list_lessons(self) -> List[Dict]:
         """List all available lessons from Google Drive."""
         print("📂 Fetching lessons from Google Drive...")
-        files = self.drive_client.list_files_in_folder()
+        files = list(self.iter_lessons())
         
         if not files:
             print("No files found in the specified folder.")
@@ -40,36 +74,33 @@ class VidCourseManager:
         print(f"\n📚 Found {len(files)} file(s):\n")
         for i, file in enumerate(files, 1):
             print(f"{i}. {file['name']} (ID: {file['id']})")
+            if file.get('folder_path'):
+                print(f"   Folder: {file['folder_path']}")
             print(f"   Type: {file.get('mimeType', 'Unknown')}")
             print(f"   Modified: {file.get('modifiedTime', 'Unknown')}")
             print()
         
         return files
     
-    def process_lesson(
-        self,
-        file_metadata: Dict,
-        course_id: Optional[str] = None,
-        stream_id: Optional[str] = None,
-        create_in_getcourse: bool = True,
-        **options
-    ) -> Dict:
+    def prepare_lesson(self, file_metadata: Dict, **options) -> Dict:
         """
-        Process a single lesson and optionally create it in GetCourse.
+        Download, format and enhance a lesson without publishing it.
         
         Args:
             file_metadata: File metadata from Google Drive.
-            course_id: Optional course ID to attach lesson to.
-            create_in_getcourse: Whether to create lesson in GetCourse.
             **options: Additional processing options.
         
         Returns:
             Processed lesson data.
         """
         print(f"🔄 Processing: {file_metadata['name']}")
-        
+        content = self.processor.fetch_content(file_metadata)
+        return self._build_lesson(file_metadata, content, **options)
+    
+    def _build_lesson(self, file_metadata: Dict, content: str, **options) -> Dict:
+        """Format and enhance downloaded content into lesson data."""
         # Process the lesson
-        lesson_data = self.processor.process_file(file_metadata)
+        lesson_data = self.processor.build_lesson(file_metadata, content)
         
         # Enhance content if options provided
         if options:
@@ -80,18 +111,62 @@ class VidCourseManager:
         
         print(f"✅ Processed: {lesson_data['title']}")
         print(f"   Description: {lesson_data['description'][:100]}...")
+        return lesson_data
+    
+    @staticmethod
+    def _lesson_request(
+        lesson_data: Dict,
+        course_id: Optional[str] = None,
+        stream_id: Optional[str] = None,
+        **options
+    ) -> Dict:
+        """Build ``create_lesson`` arguments from processed lesson data."""
+        return {
+            'title': lesson_data['title'],
+            'description': lesson_data['description'],
+            'content': lesson_data['content'],
+            'course_id': course_id,
+            'stream_id': stream_id,
+            **{k: v for k, v in options.items() if k not in ['embed_videos', 'optimize_images']}
+        }
+    
+    @staticmethod
+    def _apply_result(lesson_data: Dict, outcome: Dict) -> None:
+        """Store a batch outcome on the processed lesson data."""
+        if outcome['success']:
+            lesson_data['getcourse_id'] = outcome['result'].get('lesson_id') or lesson_data.get('getcourse_id')
+            lesson_data['getcourse_result'] = outcome['result']
+        else:
+            lesson_data['getcourse_error'] = outcome['error']
+    
+    def process_lesson(
+        self,
+        file_metadata: Dict,
+        course_id: Optional[str] = None,
+        stream_id: Optional[str] = None,
+        create_in_getcourse: bool = True,
+        **options
+    ) -> Dict:
+        """
+        Process a single lesson and optionally create it in GetCourse.
+        
+        Args:
+            file_metadata: File metadata from Google Drive.
+            course_id: Optional course ID to attach lesson to.
+            create_in_getcourse: Whether to create lesson in GetCourse.
+            **options: Additional processing options.
+        
+        Returns:
+            Processed lesson data.
+        """
+        lesson_data = self.prepare_lesson(file_metadata, **options)
         
         # Create in GetCourse if requested
         if create_in_getcourse:
             print("🚀 Creating lesson in GetCourse...")
             try:
                 result = self.getcourse_api.create_lesson(
-                    title=lesson_data['title'],
-                    description=lesson_data['description'],
-                    content=lesson_data['content'],
-                    course_id=course_id,
-                    stream_id=stream_id,
-                    **{k: v for k, v in options.items() if k not in ['embed_videos', 'optimize_images']}
+                    **self._lesson_request(lesson_data, course_id, stream_id, **options)
                 )
                 print(f"✅ Lesson created successfully in GetCourse!")
                 lesson_data['getcourse_id'] = result.get('lesson_id')
@@ -107,43 +182,406 @@ class VidCourseManager:
         course_id: Optional[str] = None,
         stream_id: Optional[str] = None,
         create_in_getcourse: bool = True,
+        force: bool = False,
+        files: Optional[Iterable[Dict]] = None,
+        fetch_workers: Optional[int] = None,
+        publish_workers: Optional[int] = None,
+        run_id: Optional[str] = None,
         **options
     ) -> List[Dict]:
         """
         Process all lessons from Google Drive folder.
         
+        Lessons flow through a staged pipeline (list → fetch → transform →
+        publish). Fetch and publish run in their own thread pools, and the
+        bounded queues between stages keep memory flat: when GetCourse is
+        slow, downloads pause instead of piling up.
+        
+        With a sync state store, files unchanged in Drive since their last
+        publish are skipped before download, and lessons that already exist
+        in GetCourse are updated with only the fields that changed.
+        
+        With a run history store, the run and every lesson outcome are
+        checkpointed as they complete; passing the ``run_id`` of a stopped
+        run continues it, skipping lessons it already finished.
+        
         Args:
             course_id: Optional course ID to attach lessons to.
             create_in_getcourse: Whether to create lessons in GetCourse.
+            force: Re-publish every lesson, ignoring the sync state.
+            files: Files to process instead of the whole folder listing.
+            fetch_workers: Parallel Google Drive downloads.
+            publish_workers: Parallel GetCourse requests.
+            run_id: ID of a stopped run to resume.
             **options: Additional processing options.
         
         Returns:
-            List of processed lesson data.
+            Summaries of the processed lessons (``file_id``, ``title``,
+            ``getcourse_id``, ``status`` and any ``getcourse_error``), in
+            listing order; lessons that failed at any step have status
+            ``failed``. Lesson content is dropped once a lesson is done,
+            so memory does not grow with the size of the run.
         """
-        files = self.list_lessons()
+        history = self.history
+        done = set()
+        if history and run_id:
+            done = history.done_file_ids(run_id)
+            in_flight = history.get_run(run_id)['lessons'].get('publishing', 0)
+            history.resume_run(run_id)
+            print(f"⏯️  Resuming run {run_id}: {len(done)} lesson(s) already done")
+            if in_flight:
+                print(
+                    f"⚠️  {in_flight} lesson(s) were being published when the run stopped; "
+                    f"they are sent again unless the sync state shows them as published"
+                )
+        elif history:
+            run_id = history.start_run('process-all', {
+                'course_id': course_id,
+                'stream_id': stream_id,
+                'create_in_getcourse': create_in_getcourse,
+                'force': force,
+                'recursive': self.recursive,
+                # Explicit file lists (e.g. from --watch) are resumed as is
+                'file_ids': [f['id'] for f in files] if isinstance(files, list) else None,
+                'options': options,
+            })
+            print(f"🧾 Run {run_id}")
         
-        if not files:
-            return []
+        # Counters are process-wide; the summary reports this run's share
+        enhancement_stats = CONTENT_RULES.stats()
+        request_stats = self.getcourse_api.get_rate_limit_stats()
         
-        processed_lessons = []
+        if files is None:
+            print("📂 Fetching lessons from Google Drive...")
+            files = self.iter_lessons()
         
-        for file in files:
-            try:
-                lesson = self.process_lesson(
-                    file,
-                    course_id=course_id,
-                    stream_id=stream_id,
-                    create_in_getcourse=create_in_getcourse,
-                    **options
+        state = self.state if create_in_getcourse else None
+        target = SyncStateStore.make_target(self.getcourse_api.account, stream_id, course_id)
+        unchanged = [0]
+        
+        def pending_files():
+            # Consumed lazily, so processing starts with the first listing page
+            for file in files:
+                if file['id'] in done:
+                    continue
+                if state and not force and state.is_unchanged(file, target):
+                    unchanged[0] += 1
+                    continue
+                yield file
+        
+        def checkpoint(item, status, **fields):
+            if history:
+                history.record_lesson(
+                    run_id, item['file']['id'], status,
+                    name=item['file'].get('name'), timings=item['timings'], **fields
                 )
-                processed_lessons.append(lesson)
-                print()  # Empty line for readability
-            except Exception as e:
-                print(f"❌ Error processing {file['name']}: {e}\n")
-                continue
         
+        def elapsed_ms(started):
+            return round((time.perf_counter() - started) * 1000)
+        
+        # Each item is a dict carrying one file through the stages; only a
+        # summary of each finished lesson is kept
+        processed_lessons = []
+        processed_lock = threading.Lock()
+        counts = {'created': 0, 'updated': 0, 'failed': 0}
+        listing_failed = [False]
+        
+        def finish(item, status, error=None):
+            # Lessons that failed before they were built have no lesson data
+            lesson = item.pop('lesson', None) or {}
+            item.pop('request', None)
+            summary = {
+                'file_id': item['file']['id'],
+                'title': lesson.get('title', item['file'].get('name')),
+                'getcourse_id': lesson.get('getcourse_id'),
+                'status': status,
+            }
+            error = error or lesson.get('getcourse_error')
+            if error:
+                summary['getcourse_error'] = str(error)
+            with processed_lock:
+                processed_lessons.append((item['index'], summary))
+        
+        def fetch(item):
+            print(f"🔄 Processing: {item['file']['name']}")
+            started = time.perf_counter()
+            item['content'] = self.processor.fetch_content(item['file'])
+            item['timings']['fetch'] = elapsed_ms(started)
+            return item
+        
+        def transform(item):
+            file = item['file']
+            started = time.perf_counter()
+            lesson = self._build_lesson(file, item.pop('content'), **options)
+            item['timings']['format'] = elapsed_ms(started)
+            item['lesson'] = lesson
+            
+            if not create_in_getcourse:
+                checkpoint(item, 'processed')
+                finish(item, 'processed')
+                return item
+            
+            item['request'] = self._lesson_request(lesson, course_id, stream_id, **options)
+            record = state.get(file['id'], target) if state else None
+            item['existing_id'] = record['getcourse_id'] if record else None
+            if item['existing_id']:
+                changed = state.changed_fields(None if force else record, lesson)
+                lesson['getcourse_id'] = item['existing_id']
+                if not changed:
+                    # Drive metadata changed but the lesson itself did not
+                    state.record_published(file, target, item['existing_id'], lesson)
+                    checkpoint(item, 'unchanged', getcourse_id=item['existing_id'])
+                    finish(item, 'unchanged')
+                    return None
+                item['request'] = {'lesson_id': item['existing_id'], **changed}
+            return item
+        
+        def publish(item):
+            lesson = item['lesson']
+            checkpoint(item, 'publishing', getcourse_id=item['existing_id'])
+            started = time.perf_counter()
+            result = self.getcourse_api.upsert_lesson(**item['request'])
+            item['timings']['publish'] = elapsed_ms(started)
+            # GetCourse reports some rejections as HTTP 200 with success=false
+            if result.get('success') is False:
+                raise RuntimeError(result.get('error_message') or result.get('error') or 'GetCourse rejected the lesson')
+            if not item['existing_id'] and not result.get('lesson_id'):
+                raise RuntimeError('GetCourse did not return the created lesson ID')
+            self._apply_result(lesson, {'success': True, 'result': result})
+            with processed_lock:
+                counts['updated' if item['existing_id'] else 'created'] += 1
+            if state:
+                state.record_published(item['file'], target, lesson['getcourse_id'], lesson)
+            checkpoint(item, 'published', getcourse_id=lesson['getcourse_id'])
+            finish(item, 'published')
+            return item
+        
+        def on_error(stage, item, error):
+            if item is None:
+                listing_failed[0] = True
+                print(f"❌ Error listing lessons: {error}\n")
+                return
+            step = {'transform': 'format'}.get(stage, stage)
+            checkpoint(item, 'failed', step=step, error=str(error))
+            if stage == 'publish':
+                item['lesson']['getcourse_error'] = str(error)
+                with processed_lock:
+                    counts['failed'] += 1
+                print(f"❌ Failed to publish '{item['lesson']['title']}' to GetCourse: {error}")
+                finish(item, 'failed')
+            else:
+                print(f"❌ Error processing {item['file'].get('name', item['file']['id'])}: {error}\n")
+                finish(item, 'failed', error)
+        
+        stages = [
+            Stage('fetch', fetch, fetch_workers or Config.FETCH_WORKERS),
+            Stage('transform', transform),
+        ]
+        if create_in_getcourse:
+            print("🚀 Publishing lessons to GetCourse...")
+            stages.append(Stage('publish', publish, publish_workers or Config.PUBLISH_WORKERS))
+        
+        def new_items():
+            for i, file in enumerate(self._with_details(pending_files())):
+                item = {'index': i, 'file': file, 'timings': {}}
+                if 'name' not in file:
+                    # Resumed by ID and the metadata lookup failed; retried on the next resume
+                    checkpoint(item, 'failed', step='list', error='file metadata unavailable')
+                    print(f"❌ Could not fetch metadata for file {file['id']}; skipping\n")
+                    finish(item, 'failed', 'file metadata unavailable')
+                    continue
+                yield item
+        
+        pipeline = Pipeline(stages, on_error=on_error)
+        items = new_items()
+        run_status = 'interrupted'
+        try:
+            for _ in pipeline.run(items):
+                pass
+            run_status = 'failed' if listing_failed[0] else 'completed'
+        finally:
+            if history:
+                history.finish_run(run_id, run_status)
+                if run_status != 'completed':
+                    print(f"⏸️  Run {run_id} {run_status}; continue it with --resume {run_id}")
+        
+        if unchanged[0]:
+            print(f"⏭️  Skipped {unchanged[0]} unchanged lesson(s)")
+        if create_in_getcourse:
+            print(
+                f"✅ Created {counts['created']}, updated {counts['updated']} lesson(s) in GetCourse"
+                + (f", {counts['failed']} failed" if counts['failed'] else "")
+            )
+        
+        processed_lessons = [lesson for _, lesson in sorted(processed_lessons, key=lambda p: p[0])]
         print(f"\n✨ Processed {len(processed_lessons)} lesson(s) successfully!")
+        
+        print("\n📊 Pipeline summary:")
+        for stats in pipeline.summary():
+            print(
+                f"   {stats['stage']:<9} {stats['items_in']:>5} in, {stats['items_out']:>5} out, "
+                f"{stats['skipped']} skipped, {stats['errors']} failed | "
+                f"{stats['workers']} worker(s), {stats['elapsed_seconds']:.1f}s, "
+                f"{stats['throughput']:.1f} items/s"
+            )
+        
+        stats = CONTENT_RULES.stats(since=enhancement_stats)
+        if stats['documents']:
+            rules = ", ".join(
+                f"{name} {rule['matches']} match(es) in {rule['seconds'] * 1000:.1f}ms"
+                for name, rule in stats['rules'].items()
+            )
+            print(f"🧩 Enhancements: {stats['documents']} document(s), {stats['seconds'] * 1000:.1f}ms | {rules}")
+        
+        if create_in_getcourse:
+            stats = {
+                key: value - request_stats.get(key, 0)
+                for key, value in self.getcourse_api.get_rate_limit_stats().items()
+            }
+            print(
+                f"⏱️  GetCourse: {stats['requests']} request(s), {stats['retries']} retr(ies), "
+                f"{stats['throttled_responses']} throttled; waited "
+                f"{stats['rate_limit_wait_seconds']:.1f}s on rate limit, "
+                f"{stats['backoff_wait_seconds']:.1f}s on backoff"
+            )
         return processed_lessons
+    
+    def resume_run(self, run_id: str, **overrides) -> List[Dict]:
+        """
+        Continue a stopped run with the arguments it was started with.
+        
+        Lessons the run already published (or found unchanged) are skipped;
+        failed and unfinished ones are processed again.
+        
+        Args:
+            run_id: Run ID printed when the run started.
+            **overrides: ``process_all_lessons`` arguments to change, such
+                as worker counts.
+        
+        Returns:
+            Summaries of the lessons processed by this continuation.
+        """
+        if not self.history:
+            print("❌ Resuming requires RUN_HISTORY_DB to be set.")
+            sys.exit(1)
+        
+        run = self.history.get_run(run_id)
+        if not run:
+            print(f"❌ Run '{run_id}' not found.")
+            sys.exit(1)
+        lessons = run['lessons']
+        if run['status'] == 'completed' and not lessons.get('failed') and not lessons.get('publishing'):
+            print(f"✅ Run {run_id} already completed.")
+            return []
+        
+        params = dict(run['params'])
+        self.recursive = params.pop('recursive', False)
+        file_ids = params.pop('file_ids', None)
+        options = params.pop('options', {})
+        files = [{'id': file_id} for file_id in file_ids] if file_ids else None
+        return self.process_all_lessons(files=files, run_id=run_id, **params, **{**options, **overrides})
+    
+    def list_runs(self, limit: int = 20) -> List[Dict]:
+        """
+        Print recent runs from the run history.
+        
+        Args:
+            limit: Maximum number of runs to show.
+        
+        Returns:
+            List of run dictionaries, newest first.
+        """
+        if not self.history:
+            print("❌ Run history is disabled (RUN_HISTORY_DB is empty).")
+            return []
+        
+        runs = self.history.list_runs(limit=limit)
+        if not runs:
+            print("No runs recorded yet.")
+        for run in runs:
+            counts = ', '.join(f"{count} {status}" for status, count in sorted(run['lessons'].items()))
+            print(f"🧾 {run['run_id']}  {run['created_at'][:19]}  {run['status']:<11} {counts or 'no lessons'}")
+        return runs
+    
+    def _with_details(self, files: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yield files with their full metadata.
+        
+        Listings leave out fields such as ``description``, which the lesson
+        processor uses; they are fetched with one batch request per 100 files.
+        """
+        files = iter(files)
+        while True:
+            chunk = list(itertools.islice(files, DRIVE_BATCH_LIMIT))
+            if not chunk:
+                return
+            try:
+                details = self.drive_client.get_files_metadata(f['id'] for f in chunk)
+            except Exception as e:
+                print(f"⚠️  Could not fetch file details, using listing metadata: {e}")
+                details = {}
+            for file in chunk:
+                detail = details.get(file['id'])
+                yield {**file, **detail['result']} if detail and detail['success'] else file
+    
+    def watch(self, interval: float = 60, **process_options) -> None:
+        """
+        Poll the Drive changes feed and process files as they change.
+        
+        Only files added or modified since the previous poll are processed,
+        so each poll costs a changes-feed read rather than a folder listing.
+        The changes-feed position is saved as soon as changes are read, so
+        files that fail are kept and processed again with the next poll.
+        
+        Args:
+            interval: Seconds between polls.
+            **process_options: Arguments for ``process_all_lessons``.
+        """
+        if not self.catalog:
+            print("❌ Watch mode requires DRIVE_CATALOG_DB to be set.")
+            sys.exit(1)
+        
+        def process(files):
+            # Returns the files to retry with the next poll
+            try:
+                summaries = self.process_all_lessons(files=files, **process_options)
+            except Exception as e:
+                print(f"❌ Processing failed: {e}")
+                return files
+            failed = {summary['file_id'] for summary in summaries if summary['status'] == 'failed'}
+            return [file for file in files if file['id'] in failed]
+        
+        retry = []
+        folder_ids = Config.get_drive_folder_ids()
+        for folder_id in folder_ids:
+            if self.catalog.get_page_token(folder_id) is None:
+                print("📂 Building Drive catalog...")
+                files = self.catalog.sync(self.drive_client, folder_id)
+                print(f"📚 Cataloged {len(files)} file(s)\n")
+                if files:
+                    retry.extend(process(files))
+        
+        print(f"👀 Watching for changes every {interval:g}s (Ctrl+C to stop)...\n")
+        try:
+            while True:
+                time.sleep(interval)
+                changed = []
+                for folder_id in folder_ids:
+                    try:
+                        changed.extend(self.catalog.sync(self.drive_client, folder_id))
+                    except Exception as e:
+                        print(f"❌ Failed to read Drive changes: {e}")
+                if changed:
+                    print(f"🔔 {len(changed)} changed file(s)\n")
+                if retry:
+                    print(f"🔁 Retrying {len(retry)} file(s) that failed earlier\n")
+                # A failed file that changed again is processed once, as changed
+                changed_ids = {file['id'] for file in changed}
+                files = changed + [file for file in retry if file['id'] not in changed_ids]
+                if files:
+                    retry = process(files)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching.")
 
 
 def main():
@@ -164,6 +602,32 @@ def main():
         help='Process all lessons from Google Drive folder'
     )
     
+    parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='RUN_ID',
+        help='Continue a stopped --process-all run where it left off'
+    )
+    
+    parser.add_argument(
+        '--list-runs',
+        action='store_true',
+        help='List recent processing runs and their lesson counts'
+    )
+    
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='Keep running and process files as they are added or modified in Google Drive'
+    )
+    
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=60,
+        help='Seconds between Google Drive change polls in --watch mode (default: 60)'
+    )
+    
     parser.add_argument(
         '--lesson-id',
         type=str,
@@ -188,6 +652,32 @@ def main():
         help='Process lessons but do not create them in GetCourse'
     )
     
+    parser.add_argument(
+        '--recursive',
+        action='store_true',
+        help='Include lessons in subfolders of the configured folders'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-publish all lessons, even those unchanged since the last sync'
+    )
+    
+    parser.add_argument(
+        '--fetch-workers',
+        type=int,
+        default=Config.FETCH_WORKERS,
+        help=f'Parallel Google Drive downloads (default: {Config.FETCH_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--publish-workers',
+        type=int,
+        default=Config.PUBLISH_WORKERS,
+        help=f'Parallel GetCourse requests (default: {Config.PUBLISH_WORKERS})'
+    )
+    
     parser.add_argument(
         '--embed-videos',
         action='store_true',
@@ -206,7 +696,7 @@ def main():
     
     # Initialize manager
     try:
-        manager = VidCourseManager()
+        manager = VidCourseManager(recursive=args.recursive)
     except Exception as e:
         print(f"❌ Initialization failed: {e}")
         sys.exit(1)
@@ -220,13 +710,38 @@ def main():
             course_id=args.course_id,
             stream_id=args.stream_id,
             create_in_getcourse=not args.no_create,
+            force=args.force,
+            fetch_workers=args.fetch_workers,
+            publish_workers=args.publish_workers,
+            embed_videos=args.embed_videos,
+            optimize_images=args.optimize_images
+        )
+    
+    elif args.resume:
+        manager.resume_run(
+            args.resume,
+            fetch_workers=args.fetch_workers,
+            publish_workers=args.publish_workers
+        )
+    
+    elif args.list_runs:
+        manager.list_runs()
+    
+    elif args.watch:
+        manager.watch(
+            interval=args.interval,
+            course_id=args.course_id,
+            stream_id=args.stream_id,
+            create_in_getcourse=not args.no_create,
+            force=args.force,
+            fetch_workers=args.fetch_workers,
+            publish_workers=args.publish_workers,
             embed_videos=args.embed_videos,
             optimize_images=args.optimize_images
         )
     
     elif args.lesson_id:
-        files = manager.drive_client.list_files_in_folder()
-        file_metadata = next((f for f in files if f['id'] == args.lesson_id), None)
+        file_metadata = manager.drive_client.get_file_in_folder(args.lesson_id, recursive=args.recursive)
         
         if not file_metadata:
             print(f"❌ Lesson with ID '{args.lesson_id}' not found.")
@@ -0,0 +1,224 @@
+"""Staged, bounded-queue thread pipeline."""
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class Stage:
+    """One pipeline step: ``func`` runs on every item in ``workers`` threads."""
+    
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1):
+        """
+        Args:
+            name: Stage name used in statistics.
+            func: Function taking an item and returning the item for the next
+                stage. Returning None drops the item.
+            workers: Number of threads running ``func``.
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+
+
+class StageStats:
+    """Counters and timings for one stage."""
+    
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items_in = 0
+        self.items_out = 0
+        self.skipped = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def record(self, outcome: str, seconds: float) -> None:
+        """Record one processed item (``out``, ``skipped`` or ``error``)."""
+        with self._lock:
+            self.items_in += 1
+            self.busy_seconds += seconds
+            if outcome == 'out':
+                self.items_out += 1
+            elif outcome == 'skipped':
+                self.skipped += 1
+            else:
+                self.errors += 1
+    
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds from the first item to the end of the stage."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+    
+    @property
+    def throughput(self) -> float:
+        """Items handled per wall-clock second."""
+        return self.items_in / self.elapsed if self.elapsed else 0.0
+    
+    def to_dict(self) -> Dict:
+        """Return the counters as a dictionary."""
+        return {
+            'stage': self.name,
+            'workers': self.workers,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'skipped': self.skipped,
+            'errors': self.errors,
+            'busy_seconds': self.busy_seconds,
+            'elapsed_seconds': self.elapsed,
+            'throughput': self.throughput,
+        }
+
+
+class Pipeline:
+    """
+    Runs items through stages connected by bounded queues.
+    
+    Every stage has its own worker threads. Queues between stages hold at
+    most ``queue_size`` items, so a slow stage makes the earlier ones wait
+    (backpressure) instead of piling items up in memory.
+    """
+    
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: Optional[int] = None,
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None
+    ):
+        """
+        Args:
+            stages: Stages in processing order.
+            queue_size: Capacity of each inter-stage queue. Defaults to twice
+                the next stage's worker count.
+            on_error: Called as ``on_error(stage_name, item, exception)`` when
+                a stage function raises; the item is then dropped.
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.source_stats = StageStats('list', 1)
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self._stop = threading.Event()
+    
+    def run(self, source: Iterable) -> Iterator:
+        """
+        Feed ``source`` through the stages.
+        
+        Args:
+            source: Items for the first stage; consumed lazily in a thread.
+        
+        Yields:
+            Items leaving the last stage, in completion order.
+        """
+        queues = [
+            queue.Queue(maxsize=self.queue_size or stage.workers * 2)
+            for stage in self.stages
+        ]
+        queues.append(queue.Queue(maxsize=self.queue_size or 2))
+        
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]), daemon=True)]
+        for index, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, self.stats[index], queues[index], queues[index + 1], remaining, lock),
+                    daemon=True
+                ))
+        for thread in threads:
+            thread.start()
+        
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=1)
+    
+    def summary(self) -> List[Dict]:
+        """Per-stage statistics, starting with the source."""
+        return [self.source_stats.to_dict()] + [s.to_dict() for s in self.stats]
+    
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """Put an item, giving up if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _feed(self, source: Iterable, target: queue.Queue) -> None:
+        stats = self.source_stats
+        stats.started_at = time.perf_counter()
+        try:
+            for item in source:
+                stats.record('out', 0.0)
+                if not self._put(target, item):
+                    return
+        except Exception as e:
+            stats.record('error', 0.0)
+            if self.on_error:
+                self.on_error(stats.name, None, e)
+        finally:
+            stats.finished_at = time.perf_counter()
+            self._put(target, _DONE)
+    
+    def _work(
+        self,
+        stage: Stage,
+        stats: StageStats,
+        source: queue.Queue,
+        target: queue.Queue,
+        remaining: List[int],
+        lock: threading.Lock
+    ) -> None:
+        while not self._stop.is_set():
+            try:
+                item = source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            if item is _DONE:
+                # Let the stage's other workers see the end marker too
+                self._put(source, _DONE)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    stats.finished_at = time.perf_counter()
+                    self._put(target, _DONE)
+                return
+            
+            if stats.started_at is None:
+                stats.started_at = time.perf_counter()
+            started = time.perf_counter()
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                stats.record('error', time.perf_counter() - started)
+                if self.on_error:
+                    self.on_error(stage.name, item, e)
+                continue
+            
+            if result is None:
+                stats.record('skipped', time.perf_counter() - started)
+                continue
+            stats.record('out', time.perf_counter() - started)
+            if not self._put(target, result):
+                return
@@ -0,0 +1,160 @@
+"""Rate limiting and retry helpers for API clients."""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    ``reserve()`` takes a token and returns how long the caller must wait
+    before using it, so the same bucket works for threads (``time.sleep``)
+    and coroutines (``asyncio.sleep``).
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second. ``0`` disables limiting.
+            capacity: Maximum burst size. Defaults to ``rate`` (at least 1).
+        """
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Take one token.
+        
+        Returns:
+            Seconds to wait before the token may be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            delay = max(0.0, self._blocked_until - now)
+            if self.rate <= 0:
+                return delay
+            
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                delay = max(delay, -self._tokens / self.rate)
+            return delay
+    
+    def defer(self, seconds: float) -> None:
+        """Hold back every caller for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that honours ``Retry-After``."""
+    
+    # Statuses worth retrying: throttling and transient server errors
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60.0
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    def should_retry(self, attempt: int, status: Optional[int] = None) -> bool:
+        """
+        Decide whether to retry.
+        
+        Args:
+            attempt: Number of retries already made.
+            status: HTTP status, or None for a connection error.
+        
+        Returns:
+            True if another attempt should be made.
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status is None or status in self.RETRY_STATUSES
+    
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+        
+        Args:
+            attempt: Number of retries already made.
+            retry_after: Value of the ``Retry-After`` header, if any.
+        
+        Returns:
+            Delay in seconds.
+        """
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class WaitStats:
+    """Thread-safe counters for time spent throttled or backing off."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self._counters = {
+                'requests': 0,
+                'retries': 0,
+                'throttled_responses': 0,
+                'server_errors': 0,
+                'connection_errors': 0,
+                'rate_limit_wait_seconds': 0.0,
+                'backoff_wait_seconds': 0.0,
+            }
+    
+    def add(self, name: str, value: float = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] += value
+    
+    def snapshot(self) -> Dict:
+        """Return a copy of the counters."""
+        with self._lock:
+            return dict(self._counters)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+    
+    Args:
+        value: Header value: delay in seconds or an HTTP date.
+    
+    Returns:
+        Delay in seconds, or None if absent or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
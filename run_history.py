@@ -0,0 +1,250 @@
+"""Durable history of bulk processing runs with per-lesson checkpoints."""
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+# Lesson statuses that need no more work when a run is resumed
+DONE_STATUSES = ('published', 'unchanged', 'processed')
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class RunHistoryStore:
+    """
+    SQLite record of bulk runs and the outcome of every lesson in them.
+    
+    Each lesson's status, step timings and GetCourse id are committed as
+    soon as it finishes, so a run that crashes or is interrupted can be
+    resumed: lessons already done are skipped and only the rest are
+    fetched and published again.
+    
+    Lesson statuses are ``publishing`` (request sent, outcome unknown),
+    ``published``, ``unchanged`` (already up to date in GetCourse),
+    ``processed`` (run without publishing) and ``failed``.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    owner TEXT,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    finished_at TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_lessons (
+                    run_id TEXT NOT NULL,
+                    file_id TEXT NOT NULL,
+                    name TEXT,
+                    status TEXT NOT NULL,
+                    step TEXT,
+                    getcourse_id TEXT,
+                    error TEXT,
+                    fetch_ms INTEGER,
+                    format_ms INTEGER,
+                    publish_ms INTEGER,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (run_id, file_id)
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS runs_owner ON runs (owner, created_at)")
+    
+    def start_run(self, kind: str, params: Dict, owner: Optional[str] = None) -> str:
+        """
+        Record the start of a new run.
+        
+        Args:
+            kind: Run type, e.g. 'process-all'.
+            params: JSON-serializable arguments needed to resume the run.
+            owner: ID of the web user who started it, if any.
+        
+        Returns:
+            The new run ID.
+        """
+        run_id = uuid.uuid4().hex[:12]
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO runs (run_id, kind, owner, status, params, created_at, updated_at)
+                VALUES (?, ?, ?, 'running', ?, ?, ?)
+                """,
+                (run_id, kind, owner, json.dumps(params), now, now)
+            )
+        return run_id
+    
+    def resume_run(self, run_id: str) -> None:
+        """Mark a stopped run as running again."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = 'running', updated_at = ?, finished_at = NULL WHERE run_id = ?",
+                (_now(), run_id)
+            )
+    
+    def finish_run(self, run_id: str, status: str) -> None:
+        """
+        Record the end of a run.
+        
+        Args:
+            run_id: Run ID.
+            status: Final status ('completed', 'cancelled', 'failed' or
+                'interrupted').
+        """
+        now = _now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ?, finished_at = ? WHERE run_id = ?",
+                (status, now, now, run_id)
+            )
+    
+    def record_lesson(
+        self,
+        run_id: str,
+        file_id: str,
+        status: str,
+        name: Optional[str] = None,
+        step: Optional[str] = None,
+        getcourse_id: Optional[str] = None,
+        error: Optional[str] = None,
+        timings: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Checkpoint one lesson of a run.
+        
+        Args:
+            run_id: Run ID.
+            file_id: Google Drive file ID.
+            status: Lesson status (see the class docstring).
+            name: File name.
+            step: Step that failed ('fetch', 'format' or 'publish').
+            getcourse_id: GetCourse lesson ID.
+            error: Error message of a failed lesson.
+            timings: Milliseconds per step, keyed 'fetch', 'format' and
+                'publish'. Steps left out keep their earlier value.
+        """
+        timings = timings or {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO run_lessons
+                    (run_id, file_id, name, status, step, getcourse_id, error,
+                     fetch_ms, format_ms, publish_ms, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, file_id) DO UPDATE SET
+                    name = COALESCE(excluded.name, run_lessons.name),
+                    status = excluded.status,
+                    step = excluded.step,
+                    getcourse_id = COALESCE(excluded.getcourse_id, run_lessons.getcourse_id),
+                    error = excluded.error,
+                    fetch_ms = COALESCE(excluded.fetch_ms, run_lessons.fetch_ms),
+                    format_ms = COALESCE(excluded.format_ms, run_lessons.format_ms),
+                    publish_ms = COALESCE(excluded.publish_ms, run_lessons.publish_ms),
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    run_id,
+                    file_id,
+                    name,
+                    status,
+                    step,
+                    str(getcourse_id) if getcourse_id is not None else None,
+                    error,
+                    timings.get('fetch'),
+                    timings.get('format'),
+                    timings.get('publish'),
+                    _now(),
+                )
+            )
+            self._conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (_now(), run_id))
+    
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        """
+        Get a run with its lesson counts per status.
+        
+        Returns:
+            Run dictionary, or None if there is no such run.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return None
+            counts = self._conn.execute(
+                "SELECT status, COUNT(*) FROM run_lessons WHERE run_id = ? GROUP BY status", (run_id,)
+            ).fetchall()
+        return self._run_dict(row, counts)
+    
+    def list_runs(self, owner: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        List recent runs, newest first.
+        
+        Args:
+            owner: Only list runs of this web user; None lists every run.
+            limit: Maximum number of runs.
+        """
+        with self._lock:
+            if owner is None:
+                rows = self._conn.execute(
+                    "SELECT * FROM runs ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM runs WHERE owner = ? ORDER BY created_at DESC LIMIT ?", (owner, limit)
+                ).fetchall()
+            runs = []
+            for row in rows:
+                counts = self._conn.execute(
+                    "SELECT status, COUNT(*) FROM run_lessons WHERE run_id = ? GROUP BY status",
+                    (row['run_id'],)
+                ).fetchall()
+                runs.append(self._run_dict(row, counts))
+        return runs
+    
+    def get_lessons(self, run_id: str) -> List[Dict]:
+        """Get the checkpointed lessons of a run, in completion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM run_lessons WHERE run_id = ? ORDER BY updated_at", (run_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def done_file_ids(self, run_id: str) -> set:
+        """Get the IDs of files a resumed run should skip."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT file_id FROM run_lessons WHERE run_id = ? AND status IN ({','.join('?' * len(DONE_STATUSES))})",
+                (run_id, *DONE_STATUSES)
+            ).fetchall()
+        return {row[0] for row in rows}
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    @staticmethod
+    def _run_dict(row: sqlite3.Row, counts) -> Dict:
+        run = dict(row)
+        run['params'] = json.loads(run['params'])
+        run['lessons'] = {status: count for status, count in counts}
+        return run
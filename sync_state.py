@@ -0,0 +1,175 @@
+"""Persistent record of what has already been published to GetCourse."""
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+
+# Lesson fields tracked for field-level updates
+LESSON_FIELDS = ('title', 'description', 'content')
+
+
+def content_hash(value: Optional[str]) -> str:
+    """Hash a lesson field value."""
+    return hashlib.sha256((value or '').encode('utf-8')).hexdigest()
+
+
+class SyncStateStore:
+    """
+    SQLite store mapping Google Drive files to published GetCourse lessons.
+    
+    For every (file, target) pair it keeps the GetCourse lesson id, the Drive
+    ``modifiedTime``/``md5Checksum`` seen at publish time and a hash of each
+    published field. That lets a sync skip unchanged files before downloading
+    them and send only the fields that actually changed.
+    
+    The target identifies where a lesson was published (account plus stream
+    or course), so the same file can be synced to several streams.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite database file.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS published_lessons (
+                    source_file_id TEXT NOT NULL,
+                    target TEXT NOT NULL,
+                    getcourse_id TEXT,
+                    modified_time TEXT,
+                    md5_checksum TEXT,
+                    field_hashes TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (source_file_id, target)
+                )
+            """)
+    
+    @staticmethod
+    def make_target(account: str, stream_id: Optional[str] = None, course_id: Optional[str] = None) -> str:
+        """Build the target key for a GetCourse account and stream/course."""
+        if stream_id:
+            return f"{account}:stream:{stream_id}"
+        if course_id:
+            return f"{account}:course:{course_id}"
+        return f"{account}:"
+    
+    def get(self, source_file_id: str, target: str) -> Optional[Dict]:
+        """
+        Get the stored record for a file.
+        
+        Args:
+            source_file_id: Google Drive file ID.
+            target: Target key from ``make_target``.
+        
+        Returns:
+            Record dictionary, or None if the file was never published there.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM published_lessons WHERE source_file_id = ? AND target = ?",
+                (source_file_id, target)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record['field_hashes'] = json.loads(record['field_hashes'])
+        return record
+    
+    def is_unchanged(self, file_metadata: Dict, target: str) -> bool:
+        """
+        Check, from listing metadata alone, whether a file needs no sync.
+        
+        Args:
+            file_metadata: File metadata from Google Drive.
+            target: Target key from ``make_target``.
+        
+        Returns:
+            True if the file was published and Drive reports no change since.
+        """
+        record = self.get(file_metadata['id'], target)
+        if record is None or not record['getcourse_id']:
+            return False
+        md5 = file_metadata.get('md5Checksum')
+        if md5 and record['md5_checksum']:
+            return md5 == record['md5_checksum']
+        modified = file_metadata.get('modifiedTime')
+        return bool(modified) and modified == record['modified_time']
+    
+    def changed_fields(self, record: Optional[Dict], lesson_data: Dict) -> Dict:
+        """
+        Get the lesson fields whose content differs from what was published.
+        
+        Args:
+            record: Record from ``get``, or None.
+            lesson_data: Processed lesson data.
+        
+        Returns:
+            Dictionary of changed field names to new values.
+        """
+        hashes = record['field_hashes'] if record else {}
+        return {
+            field: lesson_data.get(field)
+            for field in LESSON_FIELDS
+            if hashes.get(field) != content_hash(lesson_data.get(field))
+        }
+    
+    def record_published(
+        self,
+        file_metadata: Dict,
+        target: str,
+        getcourse_id: str,
+        lesson_data: Dict
+    ) -> None:
+        """
+        Record a successful publish of a file.
+        
+        Args:
+            file_metadata: File metadata from Google Drive.
+            target: Target key from ``make_target``.
+            getcourse_id: GetCourse lesson ID.
+            lesson_data: Processed lesson data that was published.
+        
+        Raises:
+            ValueError: ``getcourse_id`` is empty; a row without it would
+                make the next sync create the lesson again.
+        """
+        if not getcourse_id:
+            raise ValueError(f"No GetCourse lesson ID to record for file {file_metadata['id']}")
+        field_hashes = {field: content_hash(lesson_data.get(field)) for field in LESSON_FIELDS}
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO published_lessons
+                    (source_file_id, target, getcourse_id, modified_time, md5_checksum, field_hashes, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (source_file_id, target) DO UPDATE SET
+                    getcourse_id = excluded.getcourse_id,
+                    modified_time = excluded.modified_time,
+                    md5_checksum = excluded.md5_checksum,
+                    field_hashes = excluded.field_hashes,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    file_metadata['id'],
+                    target,
+                    str(getcourse_id),
+                    file_metadata.get('modifiedTime'),
+                    file_metadata.get('md5Checksum'),
+                    json.dumps(field_hashes),
+                    datetime.now(timezone.utc).isoformat(),
+                )
+            )
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,63 @@
+"""Tests for AsyncGetCourseAPI against the local fake GetCourse server."""
+import asyncio
+import time
+
+import aiohttp
+import pytest
+import requests
+
+from fake_getcourse import FakeGetCourseServer
+from getcourse_api import GetCourseAPI
+from getcourse_api_async import AsyncGetCourseAPI
+
+
+def _client_kwargs(server, tmp_path, account):
+    return {
+        'api_key': 'test',
+        'account': account,
+        'api_url': server.url,
+        'read_timeout': 0.3,
+        'max_retries': 3,
+        'action_cache_file': str(tmp_path / 'actions.json'),
+        'use_cache': False,
+    }
+
+
+def test_async_read_timeout_is_not_retried(tmp_path):
+    """A POST that timed out may have run; retrying it would duplicate the lesson."""
+    async def create(server):
+        async with AsyncGetCourseAPI(**_client_kwargs(server, tmp_path, 'async-timeout')) as api:
+            await api.create_lesson(title='Lesson', description='', content='<p>Text</p>')
+    
+    with FakeGetCourseServer(latency='fixed:800') as server:
+        with pytest.raises((aiohttp.ServerTimeoutError, asyncio.TimeoutError)):
+            asyncio.run(create(server))
+        # Let the server finish the request the client gave up on
+        time.sleep(1)
+        assert len(server.lessons) == 1
+
+
+def test_sync_read_timeout_is_not_retried(tmp_path):
+    with FakeGetCourseServer(latency='fixed:800') as server:
+        api = GetCourseAPI(**_client_kwargs(server, tmp_path, 'sync-timeout'))
+        with pytest.raises(requests.exceptions.Timeout):
+            api.create_lesson(title='Lesson', description='', content='<p>Text</p>')
+        api.close()
+        time.sleep(1)
+        assert len(server.lessons) == 1
+
+
+def test_create_is_not_retried_after_server_error(tmp_path):
+    """A 5xx on a create may come after the lesson was stored."""
+    async def create(server):
+        async with AsyncGetCourseAPI(**_client_kwargs(server, tmp_path, 'async-5xx')) as api:
+            await api.create_lesson(title='Lesson', description='', content='<p>Text</p>')
+    
+    with FakeGetCourseServer(error_rate=1.0) as server:
+        with pytest.raises(aiohttp.ClientResponseError):
+            asyncio.run(create(server))
+        api = GetCourseAPI(**_client_kwargs(server, tmp_path, 'sync-5xx'))
+        with pytest.raises(requests.exceptions.HTTPError):
+            api.create_lesson(title='Lesson', description='', content='<p>Text</p>')
+        api.close()
+        assert server.stats()['streams.addLesson']['requests'] == 2
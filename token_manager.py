@@ -0,0 +1,257 @@
+"""Shared, proactive refresh of Google OAuth credentials."""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, Optional
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+from config import Config
+
+
+# Called with the credentials after every successful refresh
+RefreshCallback = Callable[[Credentials], None]
+
+
+def credentials_to_dict(credentials: Credentials) -> Dict:
+    """Serialize credentials for the session, including the token expiry."""
+    return {
+        'token': credentials.token,
+        'refresh_token': credentials.refresh_token,
+        'token_uri': credentials.token_uri,
+        'client_id': credentials.client_id,
+        'client_secret': credentials.client_secret,
+        'scopes': credentials.scopes,
+        'expiry': credentials.expiry.isoformat() if credentials.expiry else None,
+    }
+
+
+def credentials_from_dict(data: Dict) -> Credentials:
+    """Rebuild credentials stored with ``credentials_to_dict``."""
+    credentials = Credentials(
+        token=data['token'],
+        refresh_token=data.get('refresh_token'),
+        token_uri=data['token_uri'],
+        client_id=data['client_id'],
+        client_secret=data.get('client_secret'),
+        scopes=data['scopes']
+    )
+    if data.get('expiry'):
+        # google-auth compares expiry against naive UTC datetimes
+        credentials.expiry = datetime.fromisoformat(data['expiry']).replace(tzinfo=None)
+    return credentials
+
+
+class _Entry:
+    """Credentials registered under one key."""
+    
+    def __init__(self, credentials: Credentials, on_refresh: Optional[RefreshCallback]):
+        self.credentials = credentials
+        self.on_refresh = on_refresh
+        self.last_used = time.monotonic()
+
+
+class TokenManager:
+    """
+    Keeps registered OAuth credentials fresh, one refresh per key at a time.
+    
+    Credentials are refreshed in the background once they come within
+    ``refresh_margin`` seconds of expiry, so callers of ``get`` normally
+    receive a valid token without waiting. Every refresh of a key goes
+    through a single in-flight future: concurrent callers share it
+    instead of each hitting the token endpoint.
+    
+    The margin should exceed google-auth's own refresh threshold (about
+    four minutes); otherwise the HTTP layer refreshes expiring tokens
+    by itself, on the request path.
+    
+    Credentials are refreshed in place, so service objects built with
+    them keep working. Keys not used for ``idle_ttl`` seconds are no
+    longer refreshed in the background.
+    """
+    
+    def __init__(
+        self,
+        refresh_margin: float = 300,
+        idle_ttl: float = 1800,
+        check_interval: float = 30,
+        max_workers: int = 4
+    ):
+        """
+        Args:
+            refresh_margin: Seconds before expiry at which a token is refreshed.
+            idle_ttl: Seconds after the last ``get`` during which a key keeps
+                being refreshed in the background.
+            check_interval: Seconds between background expiry checks.
+            max_workers: Refreshes running at the same time (across keys).
+        """
+        self.refresh_margin = refresh_margin
+        self.idle_ttl = idle_ttl
+        self.check_interval = check_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='token-refresh')
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'refreshes': 0, 'background_refreshes': 0, 'failures': 0, 'waits': 0, 'joined': 0}
+    
+    def register(
+        self,
+        key: Hashable,
+        credentials: Credentials,
+        on_refresh: Optional[RefreshCallback] = None
+    ) -> Credentials:
+        """
+        Start managing credentials, replacing any registered under ``key``.
+        
+        Args:
+            key: Owner of the credentials, e.g. a user ID.
+            credentials: google-auth credentials with a refresh token.
+            on_refresh: Called after each successful refresh, e.g. to
+                persist the new token.
+        
+        Returns:
+            The registered credentials.
+        """
+        with self._lock:
+            self._entries[key] = _Entry(credentials, on_refresh)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, name='token-watch', daemon=True)
+                self._thread.start()
+        return credentials
+    
+    def get(self, key: Hashable) -> Optional[Credentials]:
+        """
+        Get valid credentials for a key.
+        
+        Returns immediately while the token is valid, starting a background
+        refresh if it is close to expiry. Only a token that has already
+        expired (e.g. after a long idle period) makes the caller wait, and
+        then for the same refresh as every other waiting caller.
+        
+        Args:
+            key: Key passed to ``register``.
+        
+        Returns:
+            The credentials, or None if nothing is registered under ``key``.
+        
+        Raises:
+            google.auth.exceptions.RefreshError: The token had expired and
+                could not be refreshed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.last_used = time.monotonic()
+        
+        credentials = entry.credentials
+        if not credentials.refresh_token:
+            return credentials
+        if not credentials.token or not credentials.valid:
+            with self._lock:
+                self._stats['waits'] += 1
+            self.refresh(key).result()
+        elif self._needs_refresh(credentials):
+            self.refresh(key)
+        return credentials
+    
+    def refresh(self, key: Hashable) -> Future:
+        """
+        Refresh a key's credentials now, joining a refresh already running.
+        
+        Returns:
+            Future resolving to the refreshed credentials.
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats['joined'] += 1
+                return future
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError(key)
+            future = self._executor.submit(self._refresh, key, entry)
+            self._inflight[key] = future
+        return future
+    
+    def forget(self, key: Hashable) -> None:
+        """Stop managing a key's credentials, e.g. on logout."""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def stats(self) -> Dict:
+        """Return refresh counters and the number of managed keys."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['keys'] = len(self._entries)
+        return stats
+    
+    def close(self) -> None:
+        """Stop background refreshing."""
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+    
+    def _needs_refresh(self, credentials: Credentials) -> bool:
+        """Whether a token expires within the margin (or has an unknown expiry)."""
+        if credentials.expiry is None:
+            # Restored without an expiry: refresh once to learn it
+            return True
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (credentials.expiry - now).total_seconds() < self.refresh_margin
+    
+    def _refresh(self, key: Hashable, entry: _Entry) -> Credentials:
+        try:
+            entry.credentials.refresh(Request())
+        except Exception:
+            with self._lock:
+                self._stats['failures'] += 1
+            raise
+        else:
+            with self._lock:
+                self._stats['refreshes'] += 1
+            if entry.on_refresh:
+                entry.on_refresh(entry.credentials)
+            return entry.credentials
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def _watch(self) -> None:
+        """Refresh tokens of recently used keys before they expire."""
+        while not self._stop.wait(self.check_interval):
+            now = time.monotonic()
+            with self._lock:
+                due = [
+                    key for key, entry in self._entries.items()
+                    if now - entry.last_used <= self.idle_ttl
+                    and entry.credentials.refresh_token
+                    and key not in self._inflight
+                    and self._needs_refresh(entry.credentials)
+                ]
+                self._stats['background_refreshes'] += len(due)
+            for key in due:
+                try:
+                    self.refresh(key)
+                except KeyError:
+                    # Forgotten since the check
+                    pass
+
+
+_shared_manager: Optional[TokenManager] = None
+_shared_lock = threading.Lock()
+
+
+def shared_token_manager() -> TokenManager:
+    """Get the process-wide token manager, creating it on first use."""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = TokenManager(
+                refresh_margin=Config.TOKEN_REFRESH_MARGIN,
+                idle_ttl=Config.TOKEN_IDLE_TTL
+            )
+        return _shared_manager
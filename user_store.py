@@ -0,0 +1,207 @@
+"""SQLite store of web app users shared by all worker processes."""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from cache import TTLCache
+
+
+# User settings editable from the settings form
+SETTINGS_FIELDS = ('getcourse_api_key', 'getcourse_account', 'drive_folder_id')
+
+
+class UserStore:
+    """
+    SQLite table of users with a small in-process LRU in front of it.
+    
+    Logins and settings saves upsert a single row, and ``get`` loads users
+    one at a time on demand instead of reading everything at startup. The
+    database runs in WAL mode so several gunicorn workers can share it.
+    
+    Each process keeps its own LRU of recently used users. SQLite's
+    ``data_version`` changes whenever another connection commits, so a
+    write made by a different worker empties the LRU before the next read
+    and no worker serves a stale copy.
+    """
+    
+    def __init__(self, path: str, cache_size: int = 256):
+        """
+        Args:
+            path: SQLite database file.
+            cache_size: Users kept in the in-process LRU.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._cache = TTLCache(max_entries=cache_size)
+        self._data_version = None
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id TEXT PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    name TEXT,
+                    picture TEXT,
+                    getcourse_api_key TEXT,
+                    getcourse_account TEXT,
+                    drive_folder_id TEXT,
+                    settings_version INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+    
+    def get(self, user_id: str) -> Optional[Dict]:
+        """
+        Get a user.
+        
+        Args:
+            user_id: Google account ID.
+        
+        Returns:
+            User dictionary, or None if the user is unknown.
+        """
+        with self._lock:
+            self._check_external_writes()
+            user = self._cache.get(user_id)
+            if user is None:
+                user = self._select(user_id)
+                if user is not None:
+                    self._cache.set(user_id, user)
+        return dict(user) if user is not None else None
+    
+    def upsert_profile(self, user_id: str, email: str, name: Optional[str], picture: Optional[str]) -> Dict:
+        """
+        Create a user or update their Google profile fields.
+        
+        Settings of an existing user are left untouched.
+        
+        Returns:
+            The stored user dictionary.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO users (id, email, name, picture, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    email = excluded.email,
+                    name = excluded.name,
+                    picture = excluded.picture,
+                    updated_at = excluded.updated_at
+                """,
+                (user_id, email, name, picture, datetime.now(timezone.utc).isoformat())
+            )
+            return self._refresh(user_id)
+    
+    def update_settings(self, user_id: str, **settings) -> Optional[Dict]:
+        """
+        Update a user's settings and bump their ``settings_version``.
+        
+        Args:
+            user_id: Google account ID.
+            **settings: Values for ``SETTINGS_FIELDS``; None leaves a field
+                unchanged.
+        
+        Returns:
+            The updated user dictionary, or None if the user is unknown.
+        """
+        changes = {field: settings[field] for field in SETTINGS_FIELDS if settings.get(field) is not None}
+        assignments = ''.join(f"{field} = ?, " for field in changes)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"""
+                UPDATE users SET {assignments}settings_version = settings_version + 1, updated_at = ?
+                WHERE id = ?
+                """,
+                (*changes.values(), datetime.now(timezone.utc).isoformat(), user_id)
+            )
+            if cursor.rowcount == 0:
+                return None
+            return self._refresh(user_id)
+    
+    def import_json(self, path: str) -> int:
+        """
+        Import users from a legacy ``users.json`` file.
+        
+        Users already in the database are kept as they are, so importing
+        the same file from several processes at once is harmless.
+        
+        Args:
+            path: JSON file mapping user IDs to user dictionaries.
+        
+        Returns:
+            Number of users imported.
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO users
+                    (id, email, name, picture, getcourse_api_key, getcourse_account, drive_folder_id, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        user_id,
+                        user['email'],
+                        user.get('name'),
+                        user.get('picture'),
+                        user.get('getcourse_api_key'),
+                        user.get('getcourse_account'),
+                        user.get('drive_folder_id'),
+                        now,
+                    )
+                    for user_id, user in data.items()
+                ]
+            )
+            return self._conn.total_changes - before
+    
+    def migrate_json(self, path: str) -> int:
+        """
+        Import a legacy ``users.json`` once and rename it to ``*.migrated``.
+        
+        Args:
+            path: JSON file path; nothing happens if it does not exist.
+        
+        Returns:
+            Number of users imported.
+        """
+        if not os.path.exists(path):
+            return 0
+        imported = self.import_json(path)
+        try:
+            os.replace(path, path + '.migrated')
+        except FileNotFoundError:
+            # Another worker finished the migration first
+            pass
+        return imported
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _check_external_writes(self) -> None:
+        """Drop cached users if another connection has committed since the last check."""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            if self._data_version is not None:
+                self._cache.clear()
+            self._data_version = data_version
+    
+    def _select(self, user_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
+        return dict(row) if row is not None else None
+    
+    def _refresh(self, user_id: str) -> Dict:
+        """Reload a user this process just wrote and cache it."""
+        user = self._select(user_id)
+        self._cache.set(user_id, user)
+        return dict(user)
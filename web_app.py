@@ -1,19 +1,24 @@
 """Web interface for VidCourse Lesson Manager with Google OAuth authentication."""
-from flask import Flask, render_template_string, request, jsonify, session, redirect, url_for
+from flask import Flask, Response, render_template_string, request, jsonify, session, redirect, url_for, stream_with_context
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 import sys
 import os
 import json
+import time
 from typing import Dict, List, Optional
-from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 import requests
 
 from auth import User, AuthManager
+from cache import TTLCache
+from config import Config
+from content_cache import ContentCache
 from getcourse_api import GetCourseAPI
+from jobs import JobManager
+from google_drive import build_service, cached_service, get_folder_file, iter_folder_files
 from lesson_processor_v2 import LessonProcessor
+from run_history import RunHistoryStore
+from token_manager import credentials_from_dict, credentials_to_dict, shared_token_manager
 
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -32,6 +37,21 @@ login_manager.login_view = 'login'
 # Auth manager
 auth_manager = AuthManager(app)
 
+# Drive content cache shared by all users' processors
+content_cache = (
+    ContentCache(Config.CONTENT_CACHE_DIR, Config.CONTENT_CACHE_MAX_BYTES)
+    if Config.CONTENT_CACHE_DIR else None
+)
+
+# Keeps every signed-in user's Google token fresh, one refresh per user at a time
+token_manager = shared_token_manager()
+
+# Worker pool for long-running requests such as /api/process-all
+job_manager = JobManager(max_workers=Config.JOB_WORKERS)
+
+# Checkpoints of bulk runs, so a run stopped by a restart can be resumed
+run_history = RunHistoryStore(Config.RUN_HISTORY_DB) if Config.RUN_HISTORY_DB else None
+
 # OAuth scopes
 SCOPES = [
     'https://www.googleapis.com/auth/userinfo.email',
@@ -73,38 +93,40 @@ def get_google_flow():
     return flow
 
 
-def get_user_drive_client(user):
-    """Get Google Drive client for user."""
+def get_user_credentials(user):
+    """
+    Get the user's Google credentials.
+    
+    Credentials are shared by all requests of the user through the token
+    manager, which refreshes them in the background before they expire;
+    a request only waits for a refresh when the token has already expired.
+    """
     creds_data = session.get('google_credentials')
     if not creds_data:
         return None
     
-    creds = Credentials(
-        token=creds_data['token'],
-        refresh_token=creds_data.get('refresh_token'),
-        token_uri=creds_data['token_uri'],
-        client_id=creds_data['client_id'],
-        client_secret=creds_data.get('client_secret'),
-        scopes=creds_data['scopes']
-    )
-    
-    # Refresh if needed
-    if creds.expired and creds.refresh_token:
-        try:
-            creds.refresh(Request())
-            session['google_credentials'] = {
-                'token': creds.token,
-                'refresh_token': creds.refresh_token,
-                'token_uri': creds.token_uri,
-                'client_id': creds.client_id,
-                'client_secret': creds.client_secret,
-                'scopes': creds.scopes
-            }
-        except Exception as e:
-            print(f"Error refreshing token: {e}")
-            return None
+    try:
+        creds = token_manager.get(user.id)
+        if creds is None or creds.refresh_token != creds_data.get('refresh_token'):
+            # First request of this process, or the user signed in again
+            token_manager.register(user.id, credentials_from_dict(creds_data))
+            creds = token_manager.get(user.id)
+    except Exception as e:
+        print(f"Error refreshing token: {e}")
+        return None
     
-    return build('drive', 'v3', credentials=creds)
+    if creds.token != creds_data['token']:
+        # Let the session carry the refreshed token to other workers
+        session['google_credentials'] = credentials_to_dict(creds)
+    return creds
+
+
+def get_user_drive_client(user):
+    """Get Google Drive client for user."""
+    creds = get_user_credentials(user)
+    if not creds:
+        return None
+    return cached_service('drive', 'v3', creds)
 
 
 class UserManager:
@@ -112,7 +134,8 @@ class UserManager:
     
     def __init__(self, user):
         self.user = user
-        self.drive_service = get_user_drive_client(user)
+        self.credentials = get_user_credentials(user)
+        self.drive_service = cached_service('drive', 'v3', self.credentials) if self.credentials else None
         
         if user.getcourse_api_key and user.getcourse_account:
             self.getcourse_api = GetCourseAPI(
@@ -123,12 +146,16 @@ class UserManager:
             self.getcourse_api = None
         
         if self.drive_service:
-            self.processor = LessonProcessor(self.drive_service)
+            self.processor = LessonProcessor(self.drive_service, content_cache)
         else:
             self.processor = None
     
     def list_lessons(self, folder_id=None):
         """List lessons from Google Drive."""
+        return list(self.iter_lessons(folder_id))
+    
+    def iter_lessons(self, folder_id=None):
+        """Yield lessons from Google Drive as listing pages arrive."""
         if not self.drive_service:
             raise ValueError("Google Drive not connected")
         
@@ -136,25 +163,20 @@ class UserManager:
         if not folder_id:
             raise ValueError("Google Drive folder ID not set")
         
-        files = []
-        page_token = None
+        return iter_folder_files(self.drive_service, folder_id)
+    
+    def get_lesson(self, file_id):
+        """Look up one lesson by ID, or None if it is not in the user's folder."""
+        if not self.drive_service:
+            raise ValueError("Google Drive not connected")
         
-        while True:
-            query = f"'{folder_id}' in parents and trashed=false"
-            results = self.drive_service.files().list(
-                q=query,
-                pageSize=100,
-                fields="nextPageToken, files(id, name, mimeType, size, modifiedTime, webViewLink)",
-                pageToken=page_token
-            ).execute()
-            
-            files.extend(results.get('files', []))
-            page_token = results.get('nextPageToken')
-            
-            if not page_token:
-                break
+        if not self.user.drive_folder_id:
+            raise ValueError("Google Drive folder ID not set")
+        
+        if not file_id:
+            return None
         
-        return files
+        return get_folder_file(self.drive_service, file_id, [self.user.drive_folder_id])
     
     def process_lesson(self, file_metadata, stream_id=None, course_id=None):
         """Process a lesson."""
@@ -183,6 +205,157 @@ class UserManager:
             lesson_data['getcourse_error'] = 'GetCourse API not configured'
         
         return lesson_data
+    
+    def process_lessons(self, files, stream_id=None, course_id=None, job=None, run_id=None):
+        """
+        Process many lessons, publishing them through the batch API.
+        
+        When run as a background job, progress is recorded on ``job`` as
+        each lesson finishes, and a cancellation request stops it from
+        taking further files. Every lesson also emits ``fetched``,
+        ``formatted`` and ``published`` (or ``failed``) events with the
+        milliseconds spent in each step.
+        
+        With ``run_id``, every lesson outcome is checkpointed in the run
+        history, and lessons that run already finished are skipped. Lessons
+        it was still publishing when it stopped may already exist in
+        GetCourse, so they are reported as unconfirmed instead of being
+        created again.
+        """
+        if not self.processor:
+            raise ValueError("Lesson processor not available")
+        
+        history = run_history if run_id else None
+        done = history.done_file_ids(run_id) if history else set()
+        unconfirmed = {
+            lesson['file_id'] for lesson in history.get_lessons(run_id)
+            if lesson['status'] == 'publishing'
+        } if history else set()
+        results = []
+        published = []
+        publish_started = []
+        timings = {}
+        
+        def emit(event, file_metadata, **data):
+            if job:
+                job.emit(event, file_id=file_metadata.get('id'), name=file_metadata.get('name'), **data)
+        
+        def checkpoint(file_metadata, status, **fields):
+            if history:
+                history.record_lesson(
+                    run_id, file_metadata['id'], status, name=file_metadata.get('name'),
+                    timings=timings.get(file_metadata['id']), **fields
+                )
+        
+        def elapsed_ms(started):
+            return round((time.perf_counter() - started) * 1000)
+        
+        def prepared_requests():
+            for file_metadata in files:
+                if file_metadata['id'] in done:
+                    continue
+                if job:
+                    if job.cancelled:
+                        return
+                    job.add_total()
+                if file_metadata['id'] in unconfirmed:
+                    error = 'was being published when the run stopped; check GetCourse before publishing it again'
+                    results.append({
+                        'source_file_name': file_metadata.get('name'),
+                        'success': False,
+                        'unconfirmed': True,
+                        'getcourse_error': error,
+                    })
+                    emit('failed', file_metadata, step='publish', error=error)
+                    if job:
+                        job.record(False, f"{file_metadata.get('name')}: {error}")
+                    continue
+                lesson_timings = timings[file_metadata['id']] = {}
+                step = 'fetch'
+                started = time.perf_counter()
+                try:
+                    content = self.processor.fetch_content(file_metadata)
+                    lesson_timings['fetch'] = elapsed_ms(started)
+                    emit('fetched', file_metadata, ms=lesson_timings['fetch'])
+                    step = 'format'
+                    started = time.perf_counter()
+                    lesson_data = self.processor.build_lesson(file_metadata, content)
+                    lesson_timings['format'] = elapsed_ms(started)
+                    emit('formatted', file_metadata, ms=lesson_timings['format'])
+                except Exception as e:
+                    results.append({
+                        'source_file_name': file_metadata.get('name'),
+                        'success': False,
+                        'getcourse_error': str(e),
+                    })
+                    emit('failed', file_metadata, step=step, error=str(e), ms=elapsed_ms(started))
+                    checkpoint(file_metadata, 'failed', step=step, error=str(e))
+                    if job:
+                        job.record(False, f"{file_metadata.get('name')}: {e}")
+                    continue
+                results.append(lesson_data)
+                published.append(lesson_data)
+                checkpoint(file_metadata, 'publishing')
+                publish_started.append(time.perf_counter())
+                yield {
+                    'title': lesson_data['title'],
+                    'description': lesson_data['description'],
+                    'content': lesson_data['content'],
+                    'course_id': course_id,
+                    'stream_id': stream_id,
+                }
+        
+        def apply_outcome(index, outcome):
+            lesson_data = published[index]
+            file_metadata = {'id': lesson_data['source_file_id'], 'name': lesson_data['source_file_name']}
+            lesson_data['success'] = outcome['success']
+            ms = timings[file_metadata['id']]['publish'] = elapsed_ms(publish_started[index])
+            if outcome['success']:
+                lesson_data['getcourse_id'] = outcome['result'].get('lesson_id')
+                lesson_data['getcourse_result'] = outcome['result']
+                emit('published', file_metadata, getcourse_id=lesson_data['getcourse_id'], ms=ms)
+                checkpoint(file_metadata, 'published', getcourse_id=lesson_data['getcourse_id'])
+            else:
+                lesson_data['getcourse_error'] = outcome['error']
+                emit('failed', file_metadata, step='publish', error=outcome['error'], ms=ms)
+                checkpoint(file_metadata, 'failed', step='publish', error=outcome['error'])
+            if job:
+                job.record(outcome['success'], f"{lesson_data['source_file_name']}: {outcome['error']}")
+        
+        if self.getcourse_api:
+            self.getcourse_api.create_lessons(prepared_requests(), on_result=apply_outcome)
+        else:
+            for index, _ in enumerate(prepared_requests()):
+                apply_outcome(index, {'success': False, 'result': None, 'error': 'GetCourse API not configured'})
+        
+        return results
+
+
+# Client bundles keyed by (user id, settings version)
+user_managers = TTLCache(max_entries=Config.USER_CLIENT_CACHE_SIZE, ttl=Config.USER_CLIENT_CACHE_TTL)
+
+
+def get_user_manager(user):
+    """
+    Get the user's UserManager, reusing the one from a previous request.
+    
+    Tokens are refreshed in place by the token manager, so a bundle stays
+    usable across refreshes. A settings change or a new sign-in builds a
+    fresh bundle; the old one is dropped explicitly.
+    """
+    credentials = get_user_credentials(user)
+    key = (user.id, user.settings_version)
+    manager = user_managers.get(key)
+    if manager is None or manager.credentials is not credentials:
+        user_managers.invalidate(lambda k: k[0] == user.id)
+        manager = UserManager(user)
+        user_managers.set(key, manager)
+    return manager
+
+
+def invalidate_user_manager(user_id):
+    """Drop cached client bundles of a user."""
+    user_managers.invalidate(lambda key: key[0] == user_id)
 
 
 # HTML Templates
@@ -396,6 +569,14 @@ MAIN_TEMPLATE = """
             }
         }
         
+        const STEP_NAMES = {fetch: 'загрузка', format: 'форматирование', publish: 'публикация'};
+        
+        function escapeHtml(text) {
+            const div = document.createElement('div');
+            div.textContent = text == null ? '' : String(text);
+            return div.innerHTML;
+        }
+        
         async function processAll() {
             if (!confirm('Обработать все уроки?')) return;
             
@@ -407,12 +588,140 @@ MAIN_TEMPLATE = """
             });
             
             const data = await response.json();
-            if (data.success) {
-                alert(`Обработано ${data.processed} из ${data.total} уроков`);
-            } else {
+            if (!data.success) {
+                alert('Ошибка: ' + (data.error || 'Неизвестная ошибка'));
+                return;
+            }
+            
+            watchJob(data);
+        }
+        
+        function watchJob(data) {
+            const panel = document.getElementById('processResults');
+            panel.innerHTML = `
+                <div class="bg-white rounded-lg shadow-sm border p-6">
+                    <div class="flex items-center justify-between mb-4">
+                        <h2 class="text-xl font-semibold">Обработка уроков</h2>
+                        <button id="cancelJob" class="text-sm text-red-600 hover:underline">Отменить</button>
+                    </div>
+                    <p id="jobSummary" class="text-gray-600 mb-4">${data.existing ? 'Обработка уже запущена' : 'Запуск...'}</p>
+                    <div id="jobEvents" class="space-y-2"></div>
+                </div>
+            `;
+            const summary = document.getElementById('jobSummary');
+            const list = document.getElementById('jobEvents');
+            const rows = {};
+            let published = 0;
+            let failed = 0;
+            
+            document.getElementById('cancelJob').onclick = () => {
+                fetch(data.status_url + '/cancel', {method: 'POST'});
+            };
+            
+            function row(event) {
+                if (!rows[event.file_id]) {
+                    const el = document.createElement('div');
+                    el.className = 'border rounded-lg px-4 py-2 text-sm';
+                    el.innerHTML = `<span class="font-medium">${escapeHtml(event.name || event.file_id)}</span> <span class="steps text-gray-600"></span>`;
+                    list.appendChild(el);
+                    rows[event.file_id] = el;
+                }
+                return rows[event.file_id];
+            }
+            
+            function addStep(event, text, color) {
+                const el = row(event);
+                el.querySelector('.steps').insertAdjacentHTML(
+                    'beforeend', ` · <span class="${color}">${text} (${event.ms} мс)</span>`
+                );
+            }
+            
+            function updateSummary() {
+                summary.textContent = `Опубликовано: ${published}, ошибок: ${failed}`;
+            }
+            
+            const source = new EventSource(data.events_url);
+            source.addEventListener('started', () => {
+                summary.textContent = 'Обработка...';
+            });
+            source.addEventListener('fetched', e => addStep(JSON.parse(e.data), 'загружен', 'text-gray-600'));
+            source.addEventListener('formatted', e => addStep(JSON.parse(e.data), 'отформатирован', 'text-gray-600'));
+            source.addEventListener('published', e => {
+                const event = JSON.parse(e.data);
+                addStep(event, 'опубликован', 'text-green-600');
+                published++;
+                updateSummary();
+            });
+            source.addEventListener('failed', e => {
+                const event = JSON.parse(e.data);
+                addStep(event, `ошибка (${STEP_NAMES[event.step] || event.step}): ${escapeHtml(event.error)}`, 'text-red-600');
+                failed++;
+                updateSummary();
+            });
+            source.addEventListener('done', e => {
+                source.close();
+                const job = JSON.parse(e.data);
+                document.getElementById('cancelJob').remove();
+                if (job.status === 'succeeded') {
+                    summary.textContent = `Готово: обработано ${job.result.processed} из ${job.result.total} уроков`;
+                } else if (job.status === 'cancelled') {
+                    summary.textContent = `Отменено: обработано ${job.processed} из ${job.total} уроков`;
+                } else {
+                    summary.textContent = 'Ошибка: ' + (job.error || 'Неизвестная ошибка');
+                }
+                if ((job.status !== 'succeeded' || job.failed) && job.run_id) {
+                    summary.insertAdjacentHTML(
+                        'beforeend',
+                        ` <button onclick="resumeRun('${job.run_id}')" class="ml-2 text-blue-600 hover:underline">Продолжить</button>`
+                    );
+                }
+            });
+        }
+        
+        async function resumeRun(runId) {
+            const response = await fetch(`/api/runs/${runId}/resume`, {method: 'POST'});
+            const data = await response.json();
+            if (!data.success) {
                 alert('Ошибка: ' + (data.error || 'Неизвестная ошибка'));
+                return;
             }
+            watchJob(data);
         }
+        
+        async function loadUnfinishedRuns() {
+            // Runs stopped by a server restart can be continued from here
+            const data = await (await fetch('/api/runs')).json();
+            const runs = (data.runs || []).filter(run => run.status !== 'completed');
+            if (runs.length === 0) return;
+            
+            const jobs = (await (await fetch('/api/jobs')).json()).jobs || [];
+            const active = jobs.filter(job => job.status === 'queued' || job.status === 'running');
+            if (active.length > 0) {
+                watchJob({
+                    job_id: active[0].id,
+                    status_url: `/api/jobs/${active[0].id}`,
+                    events_url: `/api/jobs/${active[0].id}/events`,
+                    existing: true
+                });
+                return;
+            }
+            
+            document.getElementById('processResults').innerHTML = `
+                <div class="bg-yellow-50 border border-yellow-200 rounded-lg p-6">
+                    <h2 class="text-xl font-semibold mb-4">Незавершённые запуски</h2>
+                    <div class="space-y-2">
+                        ${runs.map(run => `
+                            <div class="flex items-center justify-between text-sm">
+                                <span>${escapeHtml(run.created_at.slice(0, 19).replace('T', ' '))} · опубликовано: ${run.lessons.published || 0}, ошибок: ${run.lessons.failed || 0}</span>
+                                <button onclick="resumeRun('${run.run_id}')" class="text-blue-600 hover:underline">Продолжить</button>
+                            </div>
+                        `).join('')}
+                    </div>
+                </div>
+            `;
+        }
+        
+        loadUnfinishedRuns();
     </script>
 </body>
 </html>
@@ -468,21 +777,16 @@ def auth_callback():
     flow.fetch_token(authorization_response=request.url)
     
     credentials = flow.credentials
-    session['google_credentials'] = {
-        'token': credentials.token,
-        'refresh_token': credentials.refresh_token,
-        'token_uri': credentials.token_uri,
-        'client_id': credentials.client_id,
-        'client_secret': credentials.client_secret,
-        'scopes': credentials.scopes
-    }
+    session['google_credentials'] = credentials_to_dict(credentials)
     
     # Get user info
-    user_info_service = build('oauth2', 'v2', credentials=credentials)
+    user_info_service = build_service('oauth2', 'v2', credentials)
     user_info = user_info_service.userinfo().get().execute()
     
     # Create or update user
     user = auth_manager.create_or_update_user(user_info, credentials)
+    token_manager.register(user.id, credentials)
+    invalidate_user_manager(user.id)
     login_user(user, remember=True)
     
     return redirect(url_for('index'))
@@ -492,6 +796,8 @@ def auth_callback():
 @login_required
 def logout():
     """Logout user."""
+    invalidate_user_manager(current_user.id)
+    token_manager.forget(current_user.id)
     logout_user()
     session.clear()
     return redirect(url_for('login'))
@@ -508,6 +814,7 @@ def api_settings():
         getcourse_account=data.get('getcourse_account'),
         drive_folder_id=data.get('drive_folder_id')
     )
+    invalidate_user_manager(current_user.id)
     
     if user:
         return jsonify({'success': True})
@@ -519,7 +826,7 @@ def api_settings():
 def api_lessons():
     """List lessons from Google Drive."""
     try:
-        manager = UserManager(current_user)
+        manager = get_user_manager(current_user)
         lessons = manager.list_lessons()
         return jsonify({'lessons': lessons})
     except Exception as e:
@@ -532,10 +839,9 @@ def api_process():
     """Process a single lesson."""
     try:
         data = request.json
-        manager = UserManager(current_user)
+        manager = get_user_manager(current_user)
         
-        lessons = manager.list_lessons()
-        lesson = next((l for l in lessons if l['id'] == data.get('lesson_id')), None)
+        lesson = manager.get_lesson(data.get('lesson_id'))
         
         if not lesson:
             return jsonify({'error': 'Lesson not found'}), 404
@@ -558,39 +864,208 @@ def api_process():
 @app.route('/api/process-all', methods=['POST'])
 @login_required
 def api_process_all():
-    """Process all lessons."""
+    """Start processing all lessons in the background."""
     try:
-        data = request.json
-        manager = UserManager(current_user)
+        data = request.json or {}
+        manager = get_user_manager(current_user)
+        if not manager.processor:
+            return jsonify({'error': 'Google Drive not connected'}), 400
         
-        lessons = manager.list_lessons()
-        processed = 0
-        errors = []
+        # A second click attaches to the run already in progress
+        job = job_manager.find_active(current_user.id, 'process-all')
+        if job:
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status_url': url_for('api_job_status', job_id=job.id),
+                'events_url': url_for('api_job_events', job_id=job.id),
+                'existing': True
+            }), 202
         
-        for lesson in lessons:
-            try:
-                result = manager.process_lesson(
-                    lesson,
-                    stream_id=data.get('stream_id'),
-                    course_id=data.get('course_id')
-                )
-                if result.get('success'):
-                    processed += 1
-                else:
-                    errors.append(f"{lesson.get('name')}: {result.get('getcourse_error', 'Unknown error')}")
-            except Exception as e:
-                errors.append(f"{lesson.get('name')}: {str(e)}")
+        # Resolve the folder now: the job runs outside the request context
+        lessons = manager.iter_lessons()
+        job = job_manager.submit(
+            current_user.id,
+            'process-all',
+            run_process_all,
+            manager,
+            lessons,
+            stream_id=data.get('stream_id'),
+            course_id=data.get('course_id')
+        )
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status_url': url_for('api_job_status', job_id=job.id),
+            'events_url': url_for('api_job_events', job_id=job.id)
+        }), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def run_process_all(job, manager, lessons, stream_id=None, course_id=None, run_id=None):
+    """
+    Background job body for /api/process-all.
+    
+    The run is recorded in the run history; passing ``run_id`` continues
+    an earlier run instead of starting a new one.
+    """
+    if run_history:
+        if run_id:
+            run_history.resume_run(run_id)
+        else:
+            run_id = run_history.start_run('process-all', {
+                'stream_id': stream_id,
+                'course_id': course_id,
+                'folder_id': manager.user.drive_folder_id,
+            }, owner=job.owner)
+        job.run_id = run_id
+    
+    run_status = 'failed'
+    try:
+        results = manager.process_lessons(
+            lessons, stream_id=stream_id, course_id=course_id, job=job, run_id=run_id
+        )
+        run_status = 'cancelled' if job.cancelled else 'completed'
+    finally:
+        if run_id:
+            run_history.finish_run(run_id, run_status)
+    return {
+        'processed': sum(1 for r in results if r.get('success')),
+        'total': len(results),
+        'unconfirmed': [r['source_file_name'] for r in results if r.get('unconfirmed')],
+        'run_id': run_id,
+    }
+
+
+@app.route('/api/runs')
+@login_required
+def api_runs():
+    """List the current user's recorded bulk runs, newest first."""
+    if not run_history:
+        return jsonify({'runs': []})
+    return jsonify({'runs': run_history.list_runs(owner=current_user.id)})
+
+
+@app.route('/api/runs/<run_id>')
+@login_required
+def api_run(run_id):
+    """Get a recorded run with its per-lesson checkpoints."""
+    run = run_history.get_run(run_id) if run_history else None
+    if not run or run['owner'] != current_user.id:
+        return jsonify({'error': 'Run not found'}), 404
+    run['lesson_results'] = run_history.get_lessons(run_id)
+    return jsonify(run)
+
+
+@app.route('/api/runs/<run_id>/resume', methods=['POST'])
+@login_required
+def api_run_resume(run_id):
+    """Continue a stopped run in the background, skipping finished lessons."""
+    try:
+        run = run_history.get_run(run_id) if run_history else None
+        if not run or run['owner'] != current_user.id:
+            return jsonify({'error': 'Run not found'}), 404
+        
+        job = job_manager.find_active(current_user.id, 'process-all')
+        if job:
+            return jsonify({'error': 'Processing is already running', 'job_id': job.id}), 409
         
+        manager = get_user_manager(current_user)
+        if not manager.processor:
+            return jsonify({'error': 'Google Drive not connected'}), 400
+        
+        params = run['params']
+        lessons = manager.iter_lessons(params.get('folder_id'))
+        job = job_manager.submit(
+            current_user.id,
+            'process-all',
+            run_process_all,
+            manager,
+            lessons,
+            stream_id=params.get('stream_id'),
+            course_id=params.get('course_id'),
+            run_id=run_id
+        )
         return jsonify({
             'success': True,
-            'processed': processed,
-            'total': len(lessons),
-            'errors': errors
-        })
+            'job_id': job.id,
+            'status_url': url_for('api_job_status', job_id=job.id),
+            'events_url': url_for('api_job_events', job_id=job.id)
+        }), 202
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/jobs')
+@login_required
+def api_jobs():
+    """List the current user's background jobs."""
+    return jsonify({'jobs': [job.to_dict() for job in job_manager.list(current_user.id)]})
+
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def api_job_status(job_id):
+    """Get the status and progress of a background job."""
+    job = job_manager.get(job_id, owner=current_user.id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/jobs/<job_id>/events')
+@login_required
+def api_job_events(job_id):
+    """
+    Stream a background job's events as Server-Sent Events.
+    
+    Every job event is sent with its ID, so a reconnecting EventSource
+    resumes after the last event it saw (``Last-Event-ID``). The stream
+    ends with a ``done`` event carrying the final job state.
+    """
+    job = job_manager.get(job_id, owner=current_user.id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    try:
+        last_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_id = 0
+    
+    def generate():
+        nonlocal last_id
+        yield 'retry: 3000\n\n'
+        while True:
+            events = job.wait_events(last_id, timeout=Config.JOB_EVENTS_KEEPALIVE)
+            for event in events:
+                last_id = event['id']
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+            if not events:
+                if job.finished:
+                    yield f"event: done\ndata: {json.dumps(job.to_dict())}\n\n"
+                    return
+                # Comment line keeps proxies from closing an idle connection
+                yield ': keep-alive\n\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+@login_required
+def api_job_cancel(job_id):
+    """Cancel a queued or running background job."""
+    job = job_manager.get(job_id, owner=current_user.id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    job_manager.cancel(job_id)
+    return jsonify(job.to_dict())
+
+
 if __name__ == '__main__':
     print("🚀 Starting VidCourse Lesson Manager with OAuth...")
     print("📝 Make sure to set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET in .env")